@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+from urllib.parse import urlencode, urlsplit
+
+class ProviderError(Exception):
+    pass
+
+#pula polaczen HTTP/1.1 keep-alive wspolna dla wszystkich dostawcow na tym samym hoscie
+class ConnectionPool:
+    def __init__(self, size=8):
+        self.size = size
+        self._idle = {}
+        self._slots = {}
+
+    def _slot(self, address):
+        if address not in self._slots:
+            self._slots[address] = asyncio.Semaphore(self.size)
+            self._idle[address] = []
+        return self._slots[address]
+
+    async def request(self, url, params=None):
+        parts = urlsplit(url)
+        address = (parts.hostname, parts.port or 80)
+        target = (parts.path or "/") + ("?" + urlencode(params) if params else "")
+        async with self._slot(address):
+            idle = self._idle[address]
+            reader, writer = idle.pop() if idle else await asyncio.open_connection(*address)
+            try:
+                body = await self._exchange(reader, writer, parts.hostname, target)
+            except BaseException:
+                writer.close()
+                raise
+            idle.append((reader, writer))
+            return body
+
+    @staticmethod
+    async def _exchange(reader, writer, host, target):
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+        await writer.drain()
+        status = await reader.readline()
+        if not status:
+            raise ProviderError("Połączenie zamknięte")
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        body = await reader.readexactly(length)
+        code = int(status.split()[1])
+        if code != 200:
+            raise ProviderError(f"HTTP {code}")
+        return json.loads(body)
+
+    async def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+            idle.clear()
+
+class FareProvider:
+    name = "?"
+
+    async def quote(self, destination, day, seat): raise NotImplementedError
+
+#dostawca lokalny (np. do testow): stale ceny i opcjonalne opoznienie
+class StaticFareProvider(FareProvider):
+    def __init__(self, name, prices, delay=0.0):
+        self.name = name
+        self.prices = prices
+        self.delay = delay
+
+    async def quote(self, destination, day, seat):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return dict(self.prices)
+
+#GET url?destination=&date=&seat= -> {"linia": cena, ...}
+class HttpFareProvider(FareProvider):
+    def __init__(self, name, url, pool):
+        self.name = name
+        self.url = url
+        self.pool = pool
+
+    async def quote(self, destination, day, seat):
+        return await self.pool.request(self.url, {"destination": destination, "date": day or "", "seat": seat or ""})
+
+class QuoteAggregator:
+    def __init__(self, providers, timeout=2.0, hedge_after=0.5, attempts=2):
+        self.providers = providers
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.attempts = attempts
+
+    async def _hedged(self, provider, destination, day, seat):
+        #kolejna proba startuje, gdy poprzednia milczy dluzej niz hedge_after albo sie nie powiodla
+        pending = set()
+        error = None
+        try:
+            for _ in range(self.attempts):
+                pending.add(asyncio.ensure_future(provider.quote(destination, day, seat)))
+                done, pending = await asyncio.wait(pending, timeout=self.hedge_after,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise ProviderError(f"{provider.name}: {error}")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _query(self, provider, destination, day, seat):
+        try:
+            quotes = await asyncio.wait_for(self._hedged(provider, destination, day, seat), self.timeout)
+            return provider.name, quotes, None
+        except (asyncio.TimeoutError, ProviderError, OSError, ValueError) as e:
+            return provider.name, None, e
+
+    async def stream(self, destination, day=None, seat=None):
+        #wyniki czesciowe w kolejnosci naplywania: (dostawca, ceny albo None, blad albo None)
+        tasks = [asyncio.ensure_future(self._query(p, destination, day, seat)) for p in self.providers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather(self, destination, day=None, seat=None):
+        fares = {}
+        async for _, quotes, _ in self.stream(destination, day, seat):
+            for airline, price in (quotes or {}).items():
+                if airline not in fares or price < fares[airline]:
+                    fares[airline] = price
+        return fares
+
+#petla asyncio w osobnym watku, zeby nie blokowac mainloop tkinter
+class BackgroundLoop:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
@@ -0,0 +1,175 @@
+from array import array
+from datetime import timedelta
+
+from engine import parse_date
+
+class UnavailableException(Exception):
+    pass
+
+def _ordinal(day):
+    if isinstance(day, str):
+        day = parse_date(day)
+    return day.toordinal()
+
+class Hold:
+    def __init__(self, name, days, count, route=None):
+        self.name = name
+        self.days = days
+        self.count = count
+        self.route = route
+        self.released = False
+
+#drzewo przedzialowe nad dniami: lisc = bitmapa zasobow z wolnym miejscem, wezel = AND dzieci
+class AvailabilityIndex:
+    def __init__(self, names, start, days, capacity=1):
+        self.names = list(names)
+        self.bits = {name: 1 << i for i, name in enumerate(self.names)}
+        self.start = _ordinal(start)
+        self.days = days
+        self.size = 1
+        while self.size < days:
+            self.size *= 2
+        self.all = (1 << len(self.names)) - 1
+        self.counts = {}
+        initial = 0
+        for name in self.names:
+            cap = capacity.get(name, 0) if isinstance(capacity, dict) else capacity
+            self.counts[name] = array("i", [cap]) * days
+            if cap > 0:
+                initial |= self.bits[name]
+        self.tree = [self.all] * (2 * self.size)
+        self.tree[self.size:self.size + days] = [initial] * days
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = self.tree[2 * node] & self.tree[2 * node + 1]
+
+    def _offset(self, day):
+        offset = _ordinal(day) - self.start
+        if not 0 <= offset < self.days:
+            raise UnavailableException(f"Brak danych o dostępności dla {day}")
+        return offset
+
+    def _update(self, day, name):
+        node = self.size + day
+        if self.counts[name][day] > 0:
+            self.tree[node] |= self.bits[name]
+        else:
+            self.tree[node] &= ~self.bits[name]
+        node //= 2
+        while node:
+            self.tree[node] = self.tree[2 * node] & self.tree[2 * node + 1]
+            node //= 2
+
+    def _query(self, lo, hi):
+        mask = self.all
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                mask &= self.tree[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                mask &= self.tree[hi]
+            lo //= 2
+            hi //= 2
+        return mask
+
+    def _names(self, mask):
+        return [name for name in self.names if mask & self.bits[name]]
+
+    def set_capacity(self, name, day, count):
+        offset = self._offset(day)
+        self.counts[name][offset] = count
+        self._update(offset, name)
+
+    def free(self, name, day):
+        return self.counts[name][self._offset(day)]
+
+    def available_between(self, first, last):
+        #wolne w kazdym dniu z [first, last)
+        lo = _ordinal(first) - self.start
+        hi = max(_ordinal(last) - self.start, lo + 1)
+        if lo < 0 or hi > self.days:
+            return []
+        return self._names(self._query(lo, hi))
+
+    def available_on(self, days):
+        mask = self.all
+        for day in days:
+            offset = _ordinal(day) - self.start
+            if not 0 <= offset < self.days:
+                return []
+            mask &= self.tree[self.size + offset]
+        return self._names(mask)
+
+    def hold(self, name, days, count=1):
+        offsets = sorted({self._offset(day) for day in days})
+        counts = self.counts[name]
+        if any(counts[o] < count for o in offsets):
+            raise UnavailableException(f"{name}: brak wolnych miejsc w wybranym terminie")
+        for o in offsets:
+            counts[o] -= count
+            if counts[o] == 0:
+                self._update(o, name)
+        return Hold(name, offsets, count)
+
+    def commit(self, hold):
+        pass        #miejsca zdjete juz przy hold
+
+    def release(self, hold):
+        if hold.released:
+            return
+        hold.released = True
+        counts = self.counts[hold.name]
+        for o in hold.days:
+            counts[o] += hold.count
+            if counts[o] == hold.count:
+                self._update(o, hold.name)
+
+def nights(departure, return_date):
+    first = parse_date(departure) if isinstance(departure, str) else departure
+    last = parse_date(return_date) if isinstance(return_date, str) else return_date
+    return [first + timedelta(days=i) for i in range(max((last - first).days, 1))]
+
+#hotele: pokoj na kazda noc od wylotu do powrotu; loty: miejsce w dniu wylotu i powrotu
+class HotelAvailability(AvailabilityIndex):
+    def bookable(self, departure, return_date):
+        return self.available_between(departure, return_date)
+
+    def hold_stay(self, name, departure, return_date):
+        return self.hold(name, nights(departure, return_date))
+
+#lot to linia + trasa + dzien: osobny indeks na kazdy cel podrozy, tworzony przy pierwszym zapytaniu
+class FlightAvailability:
+    def __init__(self, names, start, days, capacity=1):
+        self.names = list(names)
+        self.start = start
+        self.days = days
+        self.capacity = capacity
+        self.routes = {}
+
+    def route(self, destination):
+        index = self.routes.get(destination)
+        if index is None:
+            index = self.routes[destination] = AvailabilityIndex(self.names, self.start, self.days, self.capacity)
+        return index
+
+    def set_capacity(self, name, destination, day, count):
+        self.route(destination).set_capacity(name, day, count)
+
+    def free(self, name, destination, day):
+        return self.route(destination).free(name, day)
+
+    def bookable(self, destination, departure, return_date):
+        return self.route(destination).available_on([departure, return_date])
+
+    def hold_seats(self, name, destination, departure, return_date):
+        hold = self.route(destination).hold(name, [departure, return_date])
+        hold.route = destination
+        return hold
+
+    def commit(self, hold):
+        self.routes[hold.route].commit(hold)
+
+    def release(self, hold):
+        self.routes[hold.route].release(hold)
@@ -0,0 +1,78 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget import BudgetLedger
+from engine import OverBudgetException
+
+_ledger = None
+
+def _init(ledger):
+    global _ledger
+    _ledger = ledger
+
+#jeden pracownik: rezerwuje, co trzecia rezerwacje zwalnia, reszte zatwierdza
+def _work(args):
+    ledger, accounts, operations, worker = args
+    ledger = ledger or _ledger
+    ok = rejected = 0
+    for i in range(operations):
+        account = accounts[(i + worker) % len(accounts)]
+        try:
+            reservation = ledger.reserve(account, 1 + i % 7)
+        except OverBudgetException:
+            rejected += 1
+            continue
+        if i % 3 == 0:
+            ledger.release(reservation)
+        else:
+            ledger.commit(reservation)
+        ok += 1
+    return ok, rejected
+
+def run(mode, workers, accounts, operations, balance, stripes):
+    names = [f"konto{i}" for i in range(accounts)]
+    balances = dict.fromkeys(names, balance)
+    if mode == "process":
+        ledger = BudgetLedger(balances, stripes, multiprocessing.get_context())
+        pool = ProcessPoolExecutor(workers, initializer=_init, initargs=(ledger,))
+        tasks = [(None, names, operations, w) for w in range(workers)]
+    else:
+        ledger = BudgetLedger(balances, stripes)
+        pool = ThreadPoolExecutor(workers)
+        tasks = [(ledger, names, operations, w) for w in range(workers)]
+    with pool:
+        start = time.perf_counter()
+        results = list(pool.map(_work, tasks))
+        elapsed = time.perf_counter() - start
+
+    #niezmiennik: nic nie zginelo i nic nie zostalo wydane ponad budzet
+    for name in names:
+        state = ledger.snapshot(name)
+        assert state["reserved"] == 0 and state["available"] >= 0, state
+        assert state["available"] + state["spent"] == balance, state
+    total = sum(ok + rejected for ok, rejected in results)
+    return total / elapsed, sum(rejected for _, rejected in results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Test obciążeniowy BudgetLedger")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--accounts", type=int, default=64)
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--balance", type=int, default=50000)
+    parser.add_argument("--stripes", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'tryb':<8}{'pracownicy':>12}{'operacje/s':>14}{'odrzucone':>12}")
+    for workers in args.workers:
+        rate, rejected = run(args.mode, workers, args.accounts, args.operations, args.balance, args.stripes)
+        print(f"{args.mode:<8}{workers:>12}{rate:>14,.0f}{rejected:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget import BudgetLedger
+from service import BookingService
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+        self.latencies = []
+        self.errors = 0
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        start = time.perf_counter()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                          + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        payload = json.loads(await self.reader.readexactly(length))
+        self.latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            self.errors += 1
+        return status, payload
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+#pelna sciezka kreatora: sesja -> cel -> lot -> hotel -> wycena -> potwierdzenie
+async def plan_trip(client, rng):
+    _, created = await client.request("POST", "/sessions", {})
+    sid = created["session"]
+    destination = rng.choice(created["options"]["destinations"])
+    _, step = await client.request("POST", f"/sessions/{sid}/destination",
+                                   {"destination": destination, "departure_date": "2026-07-01",
+                                    "return_date": "2026-07-08"})
+    airline = rng.choice(list(step["options"]["airlines"]))
+    _, step = await client.request("POST", f"/sessions/{sid}/transport",
+                                   {"airline": airline, "seat": rng.choice(step["options"]["seats"])})
+    hotels = list(step["options"]["hotels"]) or ["Hotel A"]
+    await client.request("POST", f"/sessions/{sid}/hotel", {"hotel": rng.choice(hotels), "payment": "Karta"})
+    await client.request("GET", f"/sessions/{sid}/quote")
+    await client.request("POST", f"/sessions/{sid}/confirm")
+
+async def worker(host, port, trips, seed):
+    client = Client(host, port)
+    rng = random.Random(seed)
+    try:
+        for _ in range(trips):
+            await plan_trip(client, rng)
+    finally:
+        client.close()
+    return client
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+async def run(args):
+    server = None
+    if args.port == 0:
+        #bez --port serwis startuje w tym samym procesie na losowym porcie
+        service = BookingService(budgets=BudgetLedger({"default": 10 ** 15}))
+        server = await asyncio.start_server(service.handle, args.host, 0, backlog=4096)
+        args.port = server.sockets[0].getsockname()[1]
+    start = time.perf_counter()
+    clients = await asyncio.gather(*(worker(args.host, args.port, args.trips, seed)
+                                     for seed in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    if server:
+        server.close()
+        await server.wait_closed()
+
+    latencies = [l for c in clients for l in c.latencies]
+    errors = sum(c.errors for c in clients)
+    print(f"sesje równoległe: {args.concurrency}, żądania: {len(latencies)}, błędy: {errors}")
+    print(f"przepustowość: {len(latencies) / elapsed:,.0f} żądań/s")
+    print(f"p50: {percentile(latencies, 50) * 1000:.2f} ms  p99: {percentile(latencies, 99) * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator obciążenia dla service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 = uruchom serwis w tym procesie")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--trips", type=int, default=3, help="podróże na sesję klienta")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
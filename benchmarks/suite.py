@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Trip, Flight, Hotel, OverBudgetException, DEFAULT_AIRLINES, DEFAULT_HOTELS, SEATS, is_valid_date_format
+from money import Money, RateTable, CurrencyConverter
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def make_trips(n, rng, money=False):
+    trips = []
+    for i in range(n):
+        budget = rng.randrange(1000, 4000)
+        trip = Trip(f"Miasto {i % 500}", Money.of(budget, "EUR") if money else budget)
+        airline = rng.choice(list(DEFAULT_AIRLINES))
+        hotel = rng.choice(list(DEFAULT_HOTELS))
+        flight_price = DEFAULT_AIRLINES[airline] + rng.randrange(200)
+        trip.transport = Flight(price=Money.of(flight_price, "EUR") if money else flight_price,
+                                airline=airline, seat=rng.choice(SEATS))
+        trip.hotel = Hotel(hotel, DEFAULT_HOTELS[hotel], rng.randrange(1, 8))
+        trips.append(trip)
+    return trips
+
+def make_dicts(n, rng):
+    return [{"destination": f"Miasto {i % 500}", "budget": 3000, "departure_date": "2026-07-01",
+             "return_date": "2026-07-08",
+             "transport": {"price": rng.randrange(500, 1000), "airline": "LOT", "seat": "Okno"},
+             "hotel": {"name": "Hotel A", "price": rng.randrange(500, 1000), "nights": 7}} for i in range(n)]
+
+def make_dates(n, rng):
+    samples = ["2026-07-01", "2026-7-1", "2026-02-30", "01-07-2026", "", "2026-12-31x", "abcd-ef-gh"]
+    return [rng.choice(samples) for _ in range(n)]
+
+#kazdy benchmark: setup(n, rng) -> dane, run(dane) -> jedno przejscie po n operacjach
+def bench_total_cost(trips):
+    for trip in trips:
+        trip.total_cost()
+
+def bench_confirm(trips):
+    for trip in trips:
+        try:
+            trip.confirm()
+        except OverBudgetException:
+            pass
+
+def bench_from_dict(dicts):
+    for data in dicts:
+        Trip.from_dict(data)
+
+def bench_date_format(dates):
+    for value in dates:
+        is_valid_date_format(value)
+
+_converter = CurrencyConverter(RateTable(1, {"EUR": "4.2875", "GBP": "5.0123"}))
+
+def bench_confirm_money(trips):
+    for trip in trips:
+        try:
+            trip.confirm(_converter)
+        except OverBudgetException:
+            pass
+
+BENCHMARKS = {
+    "trip.total_cost": (lambda n, rng: make_trips(n, rng), bench_total_cost),
+    "trip.confirm": (lambda n, rng: make_trips(n, rng), bench_confirm),
+    "trip.confirm_money": (lambda n, rng: make_trips(n, rng, money=True), bench_confirm_money),
+    "trip.from_dict": (make_dicts, bench_from_dict),
+    "is_valid_date_format": (make_dates, bench_date_format),
+}
+
+def measure(run, data, ops, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(data)
+        times.append((time.perf_counter() - start) / ops * 1e9)
+    return {"ops": ops, "ns_per_op_min": min(times), "ns_per_op_median": statistics.median(times)}
+
+WIZARD_STEPS = ("destination->transport", "transport->hotel", "hotel->confirm", "update_total_price")
+
+#przejscia kreatora na ukrytym oknie (withdraw); bez ekranu uruchamiac pod xvfb-run
+def bench_wizard(rounds, repeat):
+    try:
+        import projekt
+        app = projekt.TravelPlannerApp(budget=10 ** 12)
+    except Exception as e:          #brak DISPLAY -> TclError
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    app.withdraw()
+    projekt.messagebox.showinfo = lambda *args, **kwargs: None
+    steps = {name: [] for name in WIZARD_STEPS}
+
+    def step(name, callback):
+        start = time.perf_counter()
+        callback()
+        app.update_idletasks()
+        steps[name].append((time.perf_counter() - start) * 1e9)
+
+    try:
+        for _ in range(rounds * repeat):
+            app.destination.set(app.catalog.destinations[0])
+            app.departure.set("2026-07-01")
+            app.return_date.set("2026-07-08")
+            step("destination->transport", app.validate_destination)
+            app.airline.set(next(iter(app.catalog.airlines)))
+            app.seat.set(SEATS[0])
+            step("transport->hotel", app.validate_transport)
+            app.hotel_choice.set(next(iter(app.catalog.hotels)))
+            app.selected_payment.set("Karta")
+            step("update_total_price", app.update_total_price)
+            step("hotel->confirm", app.confirm_trip)
+            app.update()
+    finally:
+        app.background.stop()
+        app.destroy()
+    return {name: {"ops": len(times), "ns_per_op_min": min(times), "ns_per_op_median": statistics.median(times)}
+            for name, times in steps.items()}
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or "ns_per_op_median" not in current or "ns_per_op_median" not in previous:
+            continue
+        ratio = current["ns_per_op_median"] / previous["ns_per_op_median"]
+        flag = "REGRESJA" if ratio > 1 + tolerance else ""
+        print(f"{name:32} {previous['ns_per_op_median']:12.0f} -> {current['ns_per_op_median']:12.0f} ns  "
+              f"x{ratio:.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki ścieżek krytycznych planera")
+    parser.add_argument("--n", type=int, default=100_000, help="operacji na przebieg")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--wizard-rounds", type=int, default=20, help="0 = bez przejść kreatora")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", help="tylko benchmarki zawierające ten tekst")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="zapisz wyniki jako nowy baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="dopuszczalne spowolnienie (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (setup, run) in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        data = setup(args.n, random.Random(args.seed))
+        run(data)                   #rozgrzewka
+        results[name] = measure(run, data, args.n, args.repeat)
+        print(f"{name:32} {results[name]['ns_per_op_median']:10.0f} ns/op")
+    #--only jak wyzej: kreator uruchamiany, gdy tekst pasuje do nazwy ktoregos kroku wizard.<krok>
+    wizard_names = [f"wizard.{name}" for name in WIZARD_STEPS]
+    if args.wizard_rounds and (not args.only or any(args.only in name for name in wizard_names)):
+        wizard = bench_wizard(args.wizard_rounds, args.repeat)
+        if "skipped" in wizard:
+            print(f"wizard: pominięte ({wizard['skipped']})")
+        else:
+            for name, result in wizard.items():
+                if args.only and args.only not in f"wizard.{name}":
+                    continue
+                results[f"wizard.{name}"] = result
+                print(f"{'wizard.' + name:32} {result['ns_per_op_median']:10.0f} ns/op")
+
+    report = {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                       "system": platform.system(), "n": args.n, "repeat": args.repeat, "time": time.time()},
+              "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"zapisano baseline: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"brak baseline ({args.baseline}); uruchom z --save-baseline")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"regresje: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
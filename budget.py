@@ -0,0 +1,81 @@
+import threading
+from array import array
+
+from engine import OverBudgetException
+from money import whole_zl
+
+AVAILABLE, RESERVED, SPENT = 0, 1, 2
+
+class Reservation:
+    def __init__(self, account, amount):
+        self.account = account
+        self.amount = amount
+        self.settled = False            #po commit albo release kolejne wywolania nic nie robia
+
+#budzety wielu kont: reserve -> commit albo release, kazde konto pod jednym z `stripes` zamkow
+class BudgetLedger:
+    def __init__(self, balances, stripes=16, context=None):
+        self.accounts = {name: i for i, name in enumerate(balances)}
+        self.stripes = stripes
+        if context is None:
+            self.cells = array("q", [0]) * (3 * len(self.accounts))
+            self.locks = [threading.Lock() for _ in range(stripes)]
+        else:
+            #wspolna pamiec i zamki miedzy procesami (przekazywac przez initializer puli)
+            self.cells = context.RawArray("q", 3 * len(self.accounts))
+            self.locks = [context.Lock() for _ in range(stripes)]
+        for name, i in self.accounts.items():
+            self.cells[3 * i + AVAILABLE] = balances[name]
+
+    def _slot(self, account):
+        index = self.accounts[account]
+        return 3 * index, self.locks[index % self.stripes]
+
+    def reserve(self, account, amount):
+        amount = whole_zl(amount)           #komorki trzymaja pelne zlotowki
+        if amount < 0:
+            raise ValueError(f"Kwota rezerwacji nie może być ujemna: {amount}")
+        base, lock = self._slot(account)
+        with lock:
+            if self.cells[base + AVAILABLE] < amount:
+                raise OverBudgetException("Budżet przekroczony!")
+            self.cells[base + AVAILABLE] -= amount
+            self.cells[base + RESERVED] += amount
+        return Reservation(account, amount)
+
+    def commit(self, reservation):
+        base, lock = self._slot(reservation.account)
+        with lock:
+            if reservation.settled:
+                return
+            reservation.settled = True
+            self.cells[base + RESERVED] -= reservation.amount
+            self.cells[base + SPENT] += reservation.amount
+
+    def release(self, reservation):
+        base, lock = self._slot(reservation.account)
+        with lock:
+            if reservation.settled:
+                return
+            reservation.settled = True
+            self.cells[base + RESERVED] -= reservation.amount
+            self.cells[base + AVAILABLE] += reservation.amount
+
+    def deposit(self, account, amount):
+        amount = whole_zl(amount)
+        if amount < 0:
+            raise ValueError(f"Kwota wpłaty nie może być ujemna: {amount}")
+        base, lock = self._slot(account)
+        with lock:
+            self.cells[base + AVAILABLE] += amount
+
+    def balance(self, account):
+        base, lock = self._slot(account)
+        with lock:
+            return self.cells[base + AVAILABLE]
+
+    def snapshot(self, account):
+        base, lock = self._slot(account)
+        with lock:
+            return {"available": self.cells[base + AVAILABLE], "reserved": self.cells[base + RESERVED],
+                    "spent": self.cells[base + SPENT]}
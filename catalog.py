@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+from engine import CatalogProvider, PriceCatalog
+
+_MISSING = object()
+
+#pamiec podreczna z czasem zycia (TTL) i limitem rozmiaru, usuwa najdawniej uzywane (LRU)
+class TTLCache:
+    def __init__(self, maxsize=4096, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+#klucz: trasa (linia/hotel + cel), dzien i klasa miejsca
+class CachedCatalogProvider(CatalogProvider):
+    def __init__(self, provider=None, maxsize=4096, ttl=300.0, clock=time.monotonic):
+        self.provider = provider or PriceCatalog()
+        self.cache = TTLCache(maxsize, ttl, clock)
+
+    @property
+    def version(self):
+        return self.provider.version
+
+    def _cached(self, key, fetch):
+        value = self.cache.get(key)
+        if value is _MISSING:
+            value = fetch()
+            self.cache.put(key, value)
+        return value
+
+    @property
+    def airlines(self):
+        return self._cached(("airlines",), lambda: self.provider.airlines)
+
+    @property
+    def hotels(self):
+        return self._cached(("hotels",), lambda: self.provider.hotels)
+
+    @property
+    def destinations(self):
+        return self._cached(("destinations",), lambda: self.provider.destinations)
+
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        price = self._cached(("flight", airline, destination, day, seat),
+                             lambda: self.provider.flight_price(airline, destination, day, seat, default=None))
+        return default if price is None else price
+
+    def hotel_price(self, name, destination=None, day=None, default=0):
+        price = self._cached(("hotel", name, destination, day),
+                             lambda: self.provider.hotel_price(name, destination, day, default=None))
+        return default if price is None else price
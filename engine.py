@@ -0,0 +1,227 @@
+import re
+import zlib
+from datetime import date
+
+from money import Money, BASE_CURRENCY, default_converter, to_money
+
+DATE_FORMAT = "%Y-%m-%d"
+DATE_PATTERN = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")     #to samo co DATE_FORMAT w strptime
+
+DEFAULT_AIRLINES = {"LOT": 800, "Ryanair": 600, "WizzAir": 700}
+DEFAULT_HOTELS = {"Hotel A": 600, "Hotel B": 800, "Hotel C": 1000}
+DEFAULT_DESTINATIONS = ["Paryż", "Rzym", "Londyn"]
+SEATS = ["Okno", "Środek", "Przejście"]
+
+class OverBudgetException(Exception):
+    pass
+
+class PaymentStrategy:
+    def pay(self, amount):
+        pass
+
+    def settle(self, payments):
+        #rozliczenie paczki jednym wywolaniem; platnosci z kluczem idempotencji (payment.key),
+        #wynik na kazda platnosc: komunikat albo wyjatek, zeby jedna odmowa nie psula calej paczki
+        results = []
+        for payment in payments:
+            try:
+                results.append(self.pay(payment.amount))
+            except Exception as e:
+                results.append(e)
+        return results
+
+class CreditCardPayment(PaymentStrategy):
+    def pay(self, amount):
+        return f"Płacę {amount} zł kartą"
+
+class CashPayment(PaymentStrategy):
+    def pay(self, amount):
+        return f"Płacę {amount} zł gotówką"
+
+PAYMENT_METHODS = {"Karta": CreditCardPayment, "Gotówka": CashPayment}
+
+def payment_for(method):
+    return PAYMENT_METHODS.get(method, CashPayment)()
+
+class Transport:
+    __slots__ = ("price", "mode")
+
+    def __init__(self, price):
+        self.price = price
+        self.mode = "Unknown"       #atrybut
+
+class Flight(Transport):
+    __slots__ = ("airline", "seat")
+
+    def __init__(self, price, airline, seat):
+        super().__init__(price)
+        self.airline = airline
+        self.seat = seat
+        self.mode = "Flight"        #nadpisanie atrybutu
+
+class Hotel:
+    __slots__ = ("price", "name", "nights")
+
+    def __init__(self, name, price, nights=1):
+        self.price = price
+        self.name = name
+        self.nights = nights
+
+    def get_price(self):
+        return self.price
+
+    def total_price(self):
+        return self.price * self.nights
+
+    def set_price(self, price):
+        if price < 0:
+            raise ValueError("Cena nie może być ujemna")
+        self.price = price
+
+class Trip:
+    __slots__ = ("destination", "budget", "transport", "legs", "hotel", "departure_date", "return_date")
+
+    def __init__(self, destination, budget):
+        self.destination = destination
+        self.budget = budget
+        self.transport = None
+        self.legs = ()          #przesiadki: lista odcinkow tylko w podrozach wielolotowych (multi_leg_trip)
+        self.hotel = None
+        self.departure_date = None
+        self.return_date = None
+
+    @classmethod
+    def from_dict(cls, data_dict):
+        trip = cls(data_dict.get("destination", ""), data_dict.get("budget", 0))
+        trip.departure_date = data_dict.get("departure_date")
+        trip.return_date = data_dict.get("return_date")
+        transport = data_dict.get("transport")
+        if transport:
+            trip.transport = Flight(price=transport.get("price", 0), airline=transport.get("airline", ""),
+                                    seat=transport.get("seat", ""))
+        hotel = data_dict.get("hotel")
+        if hotel:
+            trip.hotel = Hotel(hotel.get("name", ""), hotel.get("price", 0), hotel.get("nights", 1))
+        return trip
+
+    def total_cost(self, currency=None, converter=None):
+        #same gole zlotowki: int jak dotad; jesli jest choc jedno Money, wynik to Money w `currency`
+        if currency is None:
+            transport, hotel = self.transport, self.hotel
+            try:
+                total = (transport.price if transport else 0) + (hotel.total_price() if hotel else 0)
+                for leg in self.legs:
+                    total += leg.price
+                if not isinstance(total, Money):
+                    return total
+            except TypeError:               #int + Money w innej kolejnosci
+                pass
+            currency = self.budget.currency if isinstance(self.budget, Money) else BASE_CURRENCY
+        converter = converter or default_converter()
+        return sum((converter.convert(price, currency) for price in self._prices()), Money(0, currency))
+
+    def _prices(self):
+        if self.transport:
+            yield self.transport.price
+        for leg in self.legs:
+            yield leg.price
+        if self.hotel:
+            yield self.hotel.total_price()
+
+    def confirm(self, converter=None):
+        total = self.total_cost(None, converter)
+        if isinstance(total, Money) or isinstance(self.budget, Money):
+            #porownanie w walucie budzetu, na groszach/centach; goly budzet to zlotowki
+            budget = to_money(self.budget)
+            over = self.total_cost(budget.currency, converter) > budget
+        else:
+            over = total > self.budget
+        if over:
+            raise OverBudgetException("Budżet przekroczony!")
+
+#template method i builder
+class TripBuilderTemplate:
+    def build_trip(self):
+        self.choose_destination()
+
+    def choose_destination(self): raise NotImplementedError   #metoda
+    def choose_transport(self): raise NotImplementedError
+    def choose_hotel(self): raise NotImplementedError
+    def confirm_trip(self): raise NotImplementedError
+
+def default_catalog():
+    return dict(DEFAULT_AIRLINES), dict(DEFAULT_HOTELS)
+
+#zmienia sie razem z DEFAULT_*, wiec zapisane kopie cennika domyslnego traca waznosc
+DEFAULT_CATALOG_VERSION = f"default-{zlib.crc32(repr((DEFAULT_AIRLINES, DEFAULT_HOTELS, DEFAULT_DESTINATIONS)).encode()):08x}"
+
+#zrodlo cen: airlines/hotels to cenniki bazowe, ceny konkretnej trasy przez flight_price/hotel_price
+class CatalogProvider:
+    @property
+    def airlines(self): raise NotImplementedError
+    @property
+    def hotels(self): raise NotImplementedError
+
+    @property
+    def destinations(self):
+        return DEFAULT_DESTINATIONS
+
+    @property
+    def version(self):
+        return None         #nieznana wersja: kopii cennika nie mozna uznac za aktualna
+
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        return self.airlines.get(airline, default)
+
+    def hotel_price(self, name, destination=None, day=None, default=0):
+        return self.hotels.get(name, default)
+
+    def build_trip(self, destination, budget, departure_date, return_date, airline, seat, hotel_name):
+        trip = Trip(destination, budget)
+        trip.departure_date = departure_date
+        trip.return_date = return_date
+        price = self.flight_price(airline, destination, departure_date, seat)
+        trip.transport = Flight(price=price, airline=airline, seat=seat)
+        trip.hotel = Hotel(hotel_name, self.hotel_price(hotel_name, destination, departure_date))
+        return trip
+
+#cenniki ladowane dopiero przy pierwszym uzyciu
+class PriceCatalog(CatalogProvider):
+    def __init__(self, loader=default_catalog, version=None):
+        self._loader = loader
+        self._version = DEFAULT_CATALOG_VERSION if version is None and loader is default_catalog else version
+        self._airlines = None
+        self._hotels = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def _load(self):
+        self._airlines, self._hotels = self._loader()
+
+    @property
+    def airlines(self):
+        if self._airlines is None:
+            self._load()
+        return self._airlines
+
+    @property
+    def hotels(self):
+        if self._hotels is None:
+            self._load()
+        return self._hotels
+
+def parse_date(date_str):
+    match = DATE_PATTERN.fullmatch(date_str)
+    if match is None:
+        raise ValueError(f"Nieprawidłowy format daty: {date_str!r}")
+    year, month, day = match.groups()
+    return date(int(year), int(month), int(day))
+
+def is_valid_date_format(date_str):
+    try:
+        parse_date(date_str)
+        return True
+    except ValueError:
+        return False
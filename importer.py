@@ -0,0 +1,106 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from engine import Trip, parse_date
+from money import Money
+
+class TripImportError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"Rekord {line}: {message}")
+        self.line = line
+
+def _number(value):
+    #kwoty bez float: pelne zlotowki jako int, z groszami jako Money
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, Money)) and not isinstance(value, bool):
+        return value
+    if not isinstance(value, (str, Decimal)):
+        raise ValueError(f"Nieprawidłowa kwota: {value!r}")
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Nieprawidłowa kwota: {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Nieprawidłowa kwota: {value!r}")
+    return int(amount) if amount == amount.to_integral_value() else Money.of(amount)
+
+def _csv_record(row):
+    record = {
+        "destination": row.get("destination", ""),
+        "budget": row.get("budget"),
+        "departure_date": row.get("departure_date") or None,
+        "return_date": row.get("return_date") or None,
+    }
+    if row.get("airline"):
+        record["transport"] = {"airline": row["airline"], "seat": row.get("seat", ""),
+                               "price": row.get("flight_price")}
+    if row.get("hotel_name"):
+        record["hotel"] = {"name": row["hotel_name"], "price": row.get("hotel_price")}
+    return record
+
+def _amounts(record):
+    record["budget"] = _number(record.get("budget"))
+    for key in ("transport", "hotel"):
+        part = record.get(key)
+        if part is not None:
+            if not isinstance(part, dict):
+                raise ValueError(f"Pole {key} musi być obiektem")
+            part["price"] = _number(part.get("price"))
+    hotel = record.get("hotel")
+    if hotel is not None:
+        nights = hotel.get("nights", 1)
+        if not isinstance(nights, int) or isinstance(nights, bool) or nights < 1:
+            raise ValueError(f"Liczba nocy musi być dodatnią liczbą całkowitą: {nights!r}")
+
+def _build(line, record):
+    #bledy ze zrodla (np. zly JSON) przychodza jako rekord, zeby skip_invalid mogl je pominac
+    if isinstance(record, TripImportError):
+        raise record
+    if not isinstance(record, dict):
+        raise TripImportError(line, "Rekord musi być obiektem JSON")
+    #jedno parsowanie na pole zamiast is_valid_date_format + strptime
+    try:
+        departure = parse_date(record["departure_date"]) if record.get("departure_date") else None
+        back = parse_date(record["return_date"]) if record.get("return_date") else None
+        _amounts(record)
+    except (TypeError, ValueError) as e:
+        raise TripImportError(line, str(e)) from None
+    if departure and back and back < departure:
+        raise TripImportError(line, "Data powrotu nie może być wcześniejsza niż data wylotu.")
+    return Trip.from_dict(record)
+
+def _records_jsonl(f):
+    for line, text in enumerate(f, 1):
+        if text.strip():
+            try:
+                yield line, json.loads(text, parse_float=Decimal)
+            except json.JSONDecodeError as e:
+                yield line, TripImportError(line, str(e))
+
+def _records_csv(f):
+    for line, row in enumerate(csv.DictReader(f), 2):
+        yield line, _csv_record(row)
+
+def _trips(records, skip_invalid):
+    for line, record in records:
+        try:
+            yield _build(line, record)
+        except TripImportError:
+            if not skip_invalid:
+                raise
+
+def iter_trips(path, skip_invalid=False):
+    reader = _records_csv if str(path).endswith(".csv") else _records_jsonl
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from _trips(reader(f), skip_invalid)
+
+def iter_trip_chunks(path, chunk_size=10000, skip_invalid=False):
+    trips = iter_trips(path, skip_invalid)
+    while True:
+        chunk = list(islice(trips, chunk_size))
+        if not chunk:
+            return
+        yield chunk
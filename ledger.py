@@ -0,0 +1,145 @@
+import sqlite3
+from datetime import date
+
+from engine import parse_date
+from money import whole_zl
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    id INTEGER PRIMARY KEY,
+    destination TEXT NOT NULL,
+    departure_date INTEGER,
+    return_date INTEGER,
+    airline TEXT,
+    seat TEXT,
+    flight_price INTEGER NOT NULL,
+    hotel TEXT,
+    hotel_price INTEGER NOT NULL,
+    total_cost INTEGER NOT NULL,
+    payment_method TEXT,
+    status TEXT NOT NULL DEFAULT 'paid'
+);
+CREATE INDEX IF NOT EXISTS trips_destination ON trips (destination, departure_date);
+CREATE INDEX IF NOT EXISTS trips_return ON trips (return_date);
+CREATE TABLE IF NOT EXISTS budget (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    remaining INTEGER NOT NULL
+);
+"""
+
+#indeks pokrywajacy dla sum wydatkow; po kolumnie status, wiec tworzony po migracji
+INDEXES = """
+DROP INDEX IF EXISTS trips_departure;
+CREATE INDEX IF NOT EXISTS trips_spend ON trips (departure_date, destination, status, total_cost);
+"""
+
+PENDING, PAID, FAILED = "pending", "paid", "failed"
+
+#daty jako ordinal, zeby zakresy po indeksie byly porownaniami liczb
+def _day(value):
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = parse_date(value)
+    return value.toordinal()
+
+def _row(trip, payment_method):
+    #kolumny w pelnych zlotowkach, jak BudgetLedger (ceny w walutach przez whole_zl)
+    transport, hotel = trip.transport, trip.hotel
+    return (trip.destination, _day(trip.departure_date), _day(trip.return_date),
+            getattr(transport, "airline", None), getattr(transport, "seat", None),
+            whole_zl(transport.price if transport else 0) + sum(whole_zl(leg.price) for leg in trip.legs),
+            hotel.name if hotel else None, whole_zl(hotel.total_price()) if hotel else 0,
+            whole_zl(trip.total_cost()), payment_method)
+
+INSERT = ("INSERT INTO trips (destination, departure_date, return_date, airline, seat, flight_price,"
+          " hotel, hotel_price, total_cost, payment_method, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+class TripLedger:
+    def __init__(self, path, initial_budget=0):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(trips)")}
+        if "status" not in columns:         #baza sprzed statusow platnosci: wszystko oplacone
+            self.connection.execute("ALTER TABLE trips ADD COLUMN status TEXT NOT NULL DEFAULT 'paid'")
+        self.connection.executescript(INDEXES)
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO budget (id, remaining) VALUES (1, ?)", (initial_budget,))
+        self.fail_pending()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def remaining_budget(self):
+        return self.connection.execute("SELECT remaining FROM budget WHERE id = 1").fetchone()[0]
+
+    def record(self, trip, payment_method, status=PAID):
+        #zwraca id podrozy, potrzebne do set_status po rozliczeniu platnosci
+        row = _row(trip, payment_method) + (status,)
+        with self.connection:
+            cursor = self.connection.execute(INSERT, row)
+            self.connection.execute("UPDATE budget SET remaining = remaining - ? WHERE id = 1", (row[8],))
+        return cursor.lastrowid
+
+    def record_many(self, entries, status=PAID):
+        #jedna transakcja na paczke, budzet zmniejszany o sume paczki
+        rows = [_row(trip, method) + (status,) for trip, method in entries]
+        spent = sum(row[8] for row in rows)
+        with self.connection:
+            self.connection.executemany(INSERT, rows)
+            self.connection.execute("UPDATE budget SET remaining = remaining - ? WHERE id = 1", (spent,))
+        return spent
+
+    def set_status(self, trip_id, status):
+        #nieudana platnosc: podroz zostaje w historii, ale koszt wraca do budzetu
+        with self.connection:
+            row = self.connection.execute("SELECT status, total_cost FROM trips WHERE id = ?", (trip_id,)).fetchone()
+            if row is None or row[0] == status or row[0] == FAILED:
+                return
+            self.connection.execute("UPDATE trips SET status = ? WHERE id = ?", (status, trip_id))
+            if status == FAILED:
+                self.connection.execute("UPDATE budget SET remaining = remaining + ? WHERE id = 1", (row[1],))
+
+    def fail_pending(self):
+        #platnosci w toku z poprzedniego uruchomienia nie zostana juz rozliczone: koszt wraca do budzetu
+        with self.connection:
+            count, spent = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_cost), 0) FROM trips WHERE status = ?", (PENDING,)).fetchone()
+            if count:
+                self.connection.execute("UPDATE trips SET status = ? WHERE status = ?", (FAILED, PENDING))
+                self.connection.execute("UPDATE budget SET remaining = remaining + ? WHERE id = 1", (spent,))
+        return count
+
+    def status(self, trip_id):
+        row = self.connection.execute("SELECT status FROM trips WHERE id = ?", (trip_id,)).fetchone()
+        return row[0] if row else None
+
+    def spend_per_destination(self, start, end):
+        cursor = self.connection.execute(
+            "SELECT destination, SUM(total_cost) FROM trips WHERE departure_date BETWEEN ? AND ?"
+            " AND status != 'failed' GROUP BY destination ORDER BY destination", (_day(start), _day(end)))
+        return dict(cursor)
+
+    def spend_for_month(self, year, month):
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+        return self.spend_per_destination(start, date.fromordinal(end.toordinal() - 1))
+
+    def trips_between(self, start, end, destination=None):
+        query = ("SELECT destination, departure_date, return_date, airline, seat, hotel, total_cost, payment_method"
+                 " FROM trips WHERE departure_date BETWEEN ? AND ? AND status != 'failed'")
+        params = [_day(start), _day(end)]
+        if destination is not None:
+            query += " AND destination = ?"
+            params.append(destination)
+        for row in self.connection.execute(query + " ORDER BY departure_date", params):
+            yield row[:1] + tuple(date.fromordinal(d).isoformat() if d else None for d in row[1:3]) + row[3:]
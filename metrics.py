@@ -0,0 +1,158 @@
+import functools
+import json
+import os
+import time
+from bisect import bisect_left
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+CALLBACKS = ("choose_destination", "search_destinations", "select_destination", "validate_destination",
+             "choose_transport", "update_flight_price", "validate_transport", "drain_fares",
+             "choose_hotel", "update_total_price", "confirm_trip", "watch_payment")
+
+#histogram w stylu Prometheusa; liczniki kubelkow trzymane niekumulatywnie
+class LatencyHistogram:
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def cumulative(self):
+        running = 0
+        for le, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            yield le, running
+
+    def quantile(self, q):
+        #gorna granica kubelka, w ktorym wypada kwantyl
+        target = q * self.count
+        for le, running in self.cumulative():
+            if running >= target:
+                return self.max if le == float("inf") else le
+        return 0.0
+
+class Metrics:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.callbacks = {}
+        self.lag = LatencyHistogram()
+        self.stalls = {}                #ostatni callback przed przestojem -> liczba
+        self.last_callback = None
+
+    def histogram(self, name):
+        histogram = self.callbacks.get(name)
+        if histogram is None:
+            histogram = self.callbacks[name] = LatencyHistogram()
+        return histogram
+
+    def timed(self, name, function):
+        histogram = self.histogram(name)
+        clock = self.clock
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            self.last_callback = name
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(clock() - start)
+        return wrapper
+
+    def stall(self):
+        name = self.last_callback or "brak"
+        self.stalls[name] = self.stalls.get(name, 0) + 1
+
+    def to_prometheus(self):
+        lines = ["# HELP planner_callback_seconds Czas obslugi callbackow Tk",
+                 "# TYPE planner_callback_seconds histogram"]
+        for name, histogram in sorted(self.callbacks.items()):
+            lines += _histogram_lines("planner_callback_seconds", histogram, f'callback="{name}",')
+        lines += ["# HELP planner_loop_lag_seconds Opoznienie heartbeatu petli zdarzen",
+                  "# TYPE planner_loop_lag_seconds histogram"]
+        lines += _histogram_lines("planner_loop_lag_seconds", self.lag, "")
+        lines += ["# HELP planner_loop_stalls_total Przestoje petli zdarzen wg ostatniego callbacku",
+                  "# TYPE planner_loop_stalls_total counter"]
+        for name, count in sorted(self.stalls.items()):
+            lines.append(f'planner_loop_stalls_total{{after="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        def summary(h):
+            return {"count": h.count, "sum": h.total, "max": h.max, "p50": h.quantile(0.5), "p99": h.quantile(0.99),
+                    "buckets": dict(zip(map(str, h.buckets + (float("inf"),)), h.counts))}
+        return {"callbacks": {name: summary(h) for name, h in self.callbacks.items()},
+                "loop_lag": summary(self.lag), "stalls": dict(self.stalls)}
+
+    def write(self, path):
+        #.json -> JSON, wszystko inne -> format tekstowy Prometheusa (np. dla node_exporter textfile)
+        text = json.dumps(self.to_dict(), indent=2) if path.endswith(".json") else self.to_prometheus()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+def _histogram_lines(metric, histogram, labels):
+    lines = []
+    for le, running in histogram.cumulative():
+        bound = "+Inf" if le == float("inf") else repr(le)
+        lines.append(f'{metric}_bucket{{{labels}le="{bound}"}} {running}')
+    labels = labels.rstrip(",")
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {histogram.total}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+    return lines
+
+def instrument(app, metrics, names=CALLBACKS):
+    #nadpisuje metody na instancji; musi byc przed zbudowaniem ekranow, bo przyciski trzymaja referencje
+    for name in names:
+        method = getattr(app, name, None)
+        if method is not None:
+            setattr(app, name, metrics.timed(name, method))
+
+#heartbeat przez after(): spoznienie ponad threshold oznacza zablokowana petle Tk
+class Heartbeat:
+    def __init__(self, widget, metrics, interval=0.1, threshold=0.1, export_path=None, export_every=10.0):
+        self.widget = widget
+        self.metrics = metrics
+        self.interval = interval
+        self.threshold = threshold
+        self.export_path = export_path
+        self.export_every = export_every
+        self.job = None
+
+    def start(self):
+        clock = self.metrics.clock
+        self.expected = clock() + self.interval
+        self.next_export = clock() + self.export_every
+        self.job = self.widget.after(int(self.interval * 1000), self._beat)
+
+    def _beat(self):
+        now = self.metrics.clock()
+        lag = max(0.0, now - self.expected)
+        self.metrics.lag.observe(lag)
+        if lag >= self.threshold:
+            self.metrics.stall()
+        if self.export_path and now >= self.next_export:
+            self.metrics.write(self.export_path)
+            self.next_export = now + self.export_every
+        self.expected = now + self.interval
+        self.job = self.widget.after(int(self.interval * 1000), self._beat)
+
+    def stop(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        if self.export_path:
+            self.metrics.write(self.export_path)
@@ -0,0 +1,204 @@
+from decimal import Decimal
+from fractions import Fraction
+
+MINOR_UNITS = {"PLN": 2, "EUR": 2, "GBP": 2, "USD": 2, "CHF": 2, "CZK": 2, "JPY": 0}
+SYMBOLS = {"PLN": "zł"}
+BASE_CURRENCY = "PLN"
+
+_INT64_MAX = 2 ** 63 - 1
+
+class CurrencyMismatch(ValueError):
+    pass
+
+def _round_half_even(num, den):
+    q, r = divmod(num, den)
+    if 2 * r > den or (2 * r == den and q % 2):
+        q += 1
+    return q
+
+#kwota w groszach/centach (int), bez float
+class Money:
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor, currency=BASE_CURRENCY):
+        if currency not in MINOR_UNITS:
+            raise ValueError(f"Nieznana waluta: {currency}")
+        self.minor = int(minor)
+        self.currency = currency
+
+    @classmethod
+    def of(cls, amount, currency=BASE_CURRENCY):
+        #kwota w jednostkach glownych: int, str albo Decimal ("12.34")
+        scaled = Decimal(str(amount)).scaleb(MINOR_UNITS[currency])
+        if scaled != scaled.to_integral_value():
+            raise ValueError(f"Za dużo miejsc po przecinku dla {currency}: {amount}")
+        return cls(int(scaled), currency)
+
+    def amount(self):
+        return Decimal(self.minor).scaleb(-MINOR_UNITS[self.currency])
+
+    def _same(self, other):
+        #False -> operator zwraca NotImplemented (Money z gola liczba to TypeError)
+        if not isinstance(other, Money):
+            return False
+        if other.currency != self.currency:
+            raise CurrencyMismatch(f"{self.currency} != {other.currency}")
+        return True
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self                 #sum() zaczyna od 0
+        if not self._same(other):
+            return NotImplemented
+        return Money(self.minor + other.minor, self.currency)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not self._same(other):
+            return NotImplemented
+        return Money(self.minor - other.minor, self.currency)
+
+    def __mul__(self, factor):
+        if not isinstance(factor, int):
+            return NotImplemented
+        return Money(self.minor * factor, self.currency)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.minor == other.minor and self.currency == other.currency
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.minor, self.currency))
+
+    def __lt__(self, other):
+        return self.minor < other.minor if self._same(other) else NotImplemented
+
+    def __le__(self, other):
+        return self.minor <= other.minor if self._same(other) else NotImplemented
+
+    def __gt__(self, other):
+        return self.minor > other.minor if self._same(other) else NotImplemented
+
+    def __ge__(self, other):
+        return self.minor >= other.minor if self._same(other) else NotImplemented
+
+    def __repr__(self):
+        return f"Money({self.minor}, {self.currency!r})"
+
+    def __str__(self):
+        return f"{self.amount()} {SYMBOLS.get(self.currency, self.currency)}"
+
+def to_money(value, currency=BASE_CURRENCY):
+    #gole liczby w cennikach to zlotowki
+    return value if isinstance(value, Money) else Money.of(value, currency)
+
+def to_minor(value, currency=BASE_CURRENCY, converter=None):
+    #cena (gole zlotowki albo Money) w groszach/centach `currency`, do porownan na int
+    if not isinstance(value, Money) and currency == BASE_CURRENCY:
+        return value * 10 ** MINOR_UNITS[BASE_CURRENCY]
+    return (converter or default_converter()).convert(to_money(value), currency).minor
+
+def whole_zl(value, converter=None):
+    #budzety (BudgetLedger) i baza trzymaja pelne zlotowki: Money przeliczane na PLN i zaokraglane w gore,
+    #zeby rezerwacja nigdy nie byla mniejsza niz platnosc
+    if not isinstance(value, Money):
+        return value
+    return -(-to_minor(value, BASE_CURRENCY, converter) // 10 ** MINOR_UNITS[BASE_CURRENCY])
+
+def total(prices, currency=None, converter=None):
+    #suma cen: same gole zlotowki -> int; choc jedno Money -> Money w `currency` (domyslnie PLN)
+    prices = list(prices)
+    if currency is None:
+        if not any(isinstance(price, Money) for price in prices):
+            return sum(prices)
+        currency = BASE_CURRENCY
+    converter = converter or default_converter()
+    return sum((converter.convert(price, currency) for price in prices), Money(0, currency))
+
+def format_price(value):
+    return str(value) if isinstance(value, Money) else f"{value} zł"
+
+def to_json(value):
+    #json.dumps(default=to_json): kwota jako tekst, bez float
+    if isinstance(value, Money):
+        return {"amount": str(value.amount()), "currency": value.currency}
+    raise TypeError(f"{type(value).__name__} nie da się zapisać jako JSON")
+
+#tabela kursow: ile jednostek waluty bazowej za 1 jednostke danej waluty, dokladnie (Fraction)
+class RateTable:
+    def __init__(self, version, rates, base=BASE_CURRENCY):
+        self.version = version
+        self.base = base
+        self.rates = {code: Fraction(str(rate)) for code, rate in rates.items()}
+        self.rates[base] = Fraction(1)
+
+    def factor(self, source, target):
+        #mnoznik dla jednostek drobnych: source_minor * factor = target_minor
+        try:
+            ratio = self.rates[source] / self.rates[target]
+        except KeyError as e:
+            raise ValueError(f"Brak kursu dla {e.args[0]} w tabeli {self.version}") from None
+        return ratio * Fraction(10) ** (MINOR_UNITS[target] - MINOR_UNITS[source])
+
+class CurrencyConverter:
+    def __init__(self, table=None):
+        self.tables = {}
+        self.current = None
+        self._factors = {}              #(wersja, z, na) -> Fraction
+        if table is not None:
+            self.update(table)
+
+    def update(self, table):
+        if self.current is not None and table.version <= self.current.version:
+            raise ValueError(f"Tabela {table.version} nie jest nowsza niż {self.current.version}")
+        self.tables[table.version] = table
+        self.current = table
+
+    def _factor(self, source, target, version=None):
+        table = self.current if version is None else self.tables[version]
+        key = (table.version, source, target)
+        factor = self._factors.get(key)
+        if factor is None:
+            factor = self._factors[key] = table.factor(source, target)
+        return factor
+
+    def convert(self, money, currency, version=None):
+        money = to_money(money)
+        if money.currency == currency:
+            return money
+        factor = self._factor(money.currency, currency, version)
+        return Money(_round_half_even(money.minor * factor.numerator, factor.denominator), currency)
+
+    def convert_many(self, minors, currencies, currency, version=None):
+        #wektorowo: minors (int64) w walutach `currencies`, wynik int64 w `currency`, zaokraglenie half-even
+        import numpy as np          #leniwie, zeby engine/money ladowaly sie bez numpy
+
+        minors = np.asarray(minors, dtype=np.int64)
+        currencies = np.asarray(currencies)
+        result = np.empty_like(minors)
+        for source in np.unique(currencies):
+            mask = currencies == source
+            factor = self._factor(str(source), currency, version)
+            part = minors[mask]
+            largest = max(abs(int(part.max())), abs(int(part.min()))) if part.size else 0
+            if largest * factor.numerator > _INT64_MAX or 2 * factor.denominator > _INT64_MAX:
+                #kurs z floata ma ogromny licznik/mianownik: int64 by sie przepelnil, liczymy na int Pythona
+                result[mask] = [_round_half_even(int(m) * factor.numerator, factor.denominator) for m in part]
+                continue
+            q, r = np.divmod(part * factor.numerator, factor.denominator)
+            up = (2 * r > factor.denominator) | ((2 * r == factor.denominator) & (q % 2 == 1))
+            result[mask] = q + up
+        return result
+
+_default = CurrencyConverter(RateTable(0, {}))
+
+def default_converter():
+    return _default
+
+def set_default_converter(converter):
+    global _default
+    _default = converter
@@ -0,0 +1,79 @@
+import heapq
+from bisect import bisect_right
+
+from engine import PriceCatalog
+from money import to_minor, total
+
+class Itinerary:
+    def __init__(self, destination, departure_date, return_date, airline, hotel, cost, score, seat=None):
+        self.destination = destination
+        self.departure_date = departure_date
+        self.return_date = return_date
+        self.airline = airline
+        self.seat = seat
+        self.hotel = hotel
+        self.cost = cost
+        self.score = score          #w groszach: cena minus waga * preferencja
+
+    def __repr__(self):
+        return f"Itinerary({self.airline!r}, {self.hotel!r}, cost={self.cost}, score={self.score})"
+
+def _sorted_prices(prices):
+    #porownania w groszach, zeby cenniki z Money (EUR, GBP) mieszaly sie z gola zlotowka
+    minor = {n: to_minor(p) for n, p in prices.items()}
+    names = sorted(minor, key=minor.get)
+    return names, [minor[n] for n in names]
+
+#ceny trasy i dnia od dostawcy (flight_price/hotel_price), jak w kreatorze i serwisie
+def _hotel_prices(catalog, destination, day):
+    return {h: catalog.hotel_price(h, destination, day) for h in catalog.hotels}
+
+def _flight_prices(catalog, destination, day, seat):
+    return {a: catalog.flight_price(a, destination, day, seat) for a in catalog.airlines}
+
+def affordable_hotels(budget, flight_price, catalog=None, destination=None, day=None):
+    catalog = catalog or PriceCatalog()
+    names, prices = _sorted_prices(_hotel_prices(catalog, destination, day))
+    return names[:bisect_right(prices, to_minor(budget) - to_minor(flight_price))]
+
+def optimize(destination, departure_date, return_date, budget, k=5, catalog=None, preferences=None, weight=0,
+             seat=None):
+    catalog = catalog or PriceCatalog()
+    preferences = preferences or {}
+    limit = to_minor(budget)
+
+    #odciecie: linie i hotele, ktore nie zmieszcza sie nawet z najtanszym partnerem
+    flights = _flight_prices(catalog, destination, departure_date, seat)
+    stays = _hotel_prices(catalog, destination, departure_date)
+    hotel_names, hotel_prices = _sorted_prices(stays)
+    airline_names, airline_prices = _sorted_prices(flights)
+    if not hotel_names or not airline_names:
+        return []
+    airline_minor = dict(zip(airline_names, airline_prices))
+    hotel_minor = dict(zip(hotel_names, hotel_prices))
+    airline_names = airline_names[:bisect_right(airline_prices, limit - hotel_prices[0])]
+    hotel_names = hotel_names[:bisect_right(hotel_prices, limit - airline_prices[0])]
+
+    def item_score(name, price):
+        return price - weight * to_minor(preferences.get(name, 0))
+
+    airlines = sorted(((item_score(n, airline_minor[n]), airline_minor[n], n) for n in airline_names))
+    hotels = sorted(((item_score(n, hotel_minor[n]), hotel_minor[n], n) for n in hotel_names))
+    if not airlines or not hotels:
+        return []
+
+    #k najmniejszych sum z dwoch posortowanych list (kopiec po wyniku)
+    result = []
+    heap = [(airlines[0][0] + hotels[0][0], 0, 0)]
+    seen = {(0, 0)}
+    while heap and len(result) < k:
+        score, i, j = heapq.heappop(heap)
+        if airlines[i][1] + hotels[j][1] <= limit:
+            airline, hotel = airlines[i][2], hotels[j][2]
+            cost = total([flights[airline], stays[hotel]])
+            result.append(Itinerary(destination, departure_date, return_date, airline, hotel, cost, score, seat))
+        for ni, nj in ((i + 1, j), (i, j + 1)):
+            if ni < len(airlines) and nj < len(hotels) and (ni, nj) not in seen:
+                seen.add((ni, nj))
+                heapq.heappush(heap, (airlines[ni][0] + hotels[nj][0], ni, nj))
+    return result
@@ -1,95 +1,66 @@
+import asyncio
+import os
+import queue
+import time
+import uuid
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
-
-class OverBudgetException(Exception):
-    pass
-
-class PaymentStrategy:
-    def pay(self, amount):
-        pass
-
-class CreditCardPayment(PaymentStrategy):
-    def pay(self, amount):
-        return f"Płacę {amount} zł kartą"
-
-class CashPayment(PaymentStrategy):
-    def pay(self, amount):
-        return f"Płacę {amount} zł gotówką"
-
-class Transport:
-    def __init__(self, price):
-        self.price = price
-        self.mode = "Unknown"       #atrybut
-
-class Flight(Transport):
-    def __init__(self, price, airline, seat):
-        super().__init__(price)
-        self.airline = airline
-        self.seat = seat
-        self.mode = "Flight"        #nadpisanie atrybutu
-
-class Hotel:
-    def __init__(self, name, price):
-        self.price = price
-        self.name = name
-
-    def get_price(self):
-        return self.price
-
-    def set_price(self, price):
-        if price < 0:
-            raise ValueError("Cena nie może być ujemna")
-        self.price = price
-
-class Trip:
-    def __init__(self, destination, budget):
-        self.destination = destination
-        self.budget = budget
-        self.transport = None
-        self.hotel = None
-        self.departure_date = None
-        self.return_date = None
-
-    @classmethod
-    def from_dict(cls, data_dict):
-        trip = cls(data_dict.get("destination", ""), data_dict.get("budget", 0))
-        trip.departure_date = data_dict.get("departure_date")
-        trip.return_date = data_dict.get("return_date")
-        return trip
-
-    def total_cost(self):
-        total = 0
-        if self.transport:
-            total += self.transport.price
-        if self.hotel:
-            total += self.hotel.get_price()
-        return total
-
-    def confirm(self):
-        if self.total_cost() > self.budget:
-            raise OverBudgetException("Budżet przekroczony!")
-
-#template method i builder
-class TripBuilderTemplate:
-    def build_trip(self):
-        self.choose_destination()
-
-    def choose_destination(self): raise NotImplementedError   #metoda
-    def choose_transport(self): raise NotImplementedError
-    def choose_hotel(self): raise NotImplementedError
-    def confirm_trip(self): raise NotImplementedError
+
+from engine import (OverBudgetException, PaymentStrategy, CreditCardPayment, CashPayment,
+                    Transport, Flight, Hotel, Trip, TripBuilderTemplate, PriceCatalog,
+                    SEATS, payment_for, parse_date, is_valid_date_format)
+from optimizer import affordable_hotels
+from ledger import TripLedger, PENDING, PAID, FAILED
+from catalog import CachedCatalogProvider
+from aggregator import BackgroundLoop
+from search import DestinationIndex, normalize
+from widgets import VirtualList
+from availability import UnavailableException
+from seats import NoSeatException, SeatInventory
+from budget import BudgetLedger
+from money import format_price, total as money_total
+from settlement import SettlementPipeline, Payment
+from metrics import Metrics, Heartbeat, instrument
+from snapshot import Snapshot, SnapshotError, FIELDS, load_snapshot, save_snapshot
 
 class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
-    def __init__(self):
+    def __init__(self, budget=3000, catalog=None, ledger=None, aggregator=None,
+                 hotel_availability=None, flight_availability=None, seats=None,
+                 budgets=None, account="default", settlement=None, metrics=None, metrics_path=None,
+                 snapshot_path=None, catalog_max_age=24 * 3600):
         super().__init__()
-        self.budget = 3000
+        #stan z poprzedniego uruchomienia; budzet z pliku tylko bez bazy (baza jest wazniejsza)
+        self.snapshot_path = snapshot_path
+        snapshot = self.read_snapshot(account)
+        self.catalog_loaded_at = time.time()
+        if snapshot:
+            budget = snapshot.budget
+            #zapisany cennik tylko gdy zrodlo ma te sama wersje i kopia nie jest przeterminowana
+            source = catalog or PriceCatalog()
+            if catalog is None and snapshot.catalog_fresh(source.version, catalog_max_age, time.time()):
+                source = snapshot.catalog()
+                self.catalog_loaded_at = snapshot.catalog_loaded_at
+            catalog = source
+        self.seats = seats
+        self.hotel_availability = hotel_availability
+        self.flight_availability = flight_availability
+        self.ledger = ledger
+        self.aggregator = aggregator
+        self.background = BackgroundLoop()
+        self.settlement = settlement or SettlementPipeline()
+        self.live_fares = {}
+        self.fare_results = None
+        self.fare_key = None
+        self.account = account
+        self.budgets = budgets or BudgetLedger({account: ledger.remaining_budget if ledger else budget})
         self.trip = Trip("", self.budget)
 
         self.title("Travel Planner")
         self.geometry("400x500")
 
         self.destination = tk.StringVar()
+        self.destination_query = tk.StringVar()
+        self.search_job = None
         self.departure = tk.StringVar()
         self.return_date = tk.StringVar()
         self.airline = tk.StringVar()
@@ -97,30 +68,89 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         self.hotel_choice = tk.StringVar()
         self.selected_payment = tk.StringVar()
 
-        self.airlines = {"LOT": 800, "Ryanair": 600, "WizzAir": 700}
-        self.hotels = {"Hotel A": 600, "Hotel B": 800, "Hotel C": 1000}
+        self.catalog = CachedCatalogProvider(catalog)
+        #indeks wyszukiwania budowany w tle od razu po starcie, nie przy otwieraniu ekranu
+        self.destination_index = self.background.submit(
+            asyncio.to_thread(DestinationIndex, list(self.catalog.destinations)))
 
         self.budget_label = ttk.Label(self, text=f"Budżet: {self.budget} zł", font=("Arial", 14))
         self.budget_label.pack(pady=5)
+        self.payment_label = ttk.Label(self, text="")
+        self.payment_label.pack()
+
+        #ekrany kreatora budowane raz, przy pierwszym uzyciu, potem tylko podnoszone
+        self.container = ttk.Frame(self)
+        self.container.pack(expand=True, fill="both")
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+        self.screens = {}
+        self.step = None
+
+        #pomiary opcjonalne: histogramy callbackow i heartbeat petli zdarzen
+        self.metrics = metrics
+        self.heartbeat = None
+        if metrics:
+            instrument(self, metrics)
+            self.heartbeat = Heartbeat(self, metrics, export_path=metrics_path)
+            self.heartbeat.start()
 
         self.build_trip()
+        if snapshot:
+            self.restore(snapshot)
 
-    def clear_frame(self):
-        for widget in self.winfo_children():
-            if widget != self.budget_label:
-                widget.destroy()
+    def read_snapshot(self, account):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            snapshot = load_snapshot(self.snapshot_path)
+        except (OSError, SnapshotError):
+            return None         #uszkodzony albo stary plik: zwykly start
+        return snapshot if snapshot.account == account else None
+
+    def snapshot(self):
+        return Snapshot(self.step or "destination", self.account, self.budget,
+                        {name: getattr(self, name).get() for name in FIELDS},
+                        dict(self.catalog.airlines), dict(self.catalog.hotels), list(self.catalog.destinations),
+                        self.catalog.version, self.catalog_loaded_at)
+
+    def restore(self, snapshot):
+        for name, value in snapshot.fields.items():
+            getattr(self, name).set(value)
+        if snapshot.step == "transport":
+            self.choose_transport()
+        elif snapshot.step == "hotel":
+            self.choose_transport()
+            self.choose_hotel()
+
+    def show_screen(self, name, build):
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.screens[name] = ttk.Frame(self.container)
+            screen.grid(row=0, column=0, sticky="nsew")
+            frame = ttk.Frame(screen)
+            frame.pack(expand=True)
+            build(frame)
+        screen.tkraise()
+        self.step = name
+        return screen
+
+    @property
+    def budget(self):
+        return self.budgets.balance(self.account)
 
     def update_budget_label(self):
         self.budget_label.config(text=f"Budżet: {self.budget} zł")
 
     def choose_destination(self):       #nadpisanie metody
-        self.clear_frame()
-        frame = ttk.Frame(self)
-        frame.pack(expand=True)
+        self.show_screen("destination", self.build_destination_screen)
 
+    def build_destination_screen(self, frame):
         ttk.Label(frame, text="Wybierz miejsce docelowe:").pack(pady=5)
-        dest_combo = ttk.Combobox(frame, textvariable=self.destination, values=["Paryż", "Rzym", "Londyn"], state="readonly")
-        dest_combo.pack()
+        ttk.Entry(frame, textvariable=self.destination_query).pack()
+        self.destination_list = VirtualList(frame, rows=6, command=self.select_destination)
+        self.destination_list.pack(pady=5)
+        self.destination_list.set_items(list(self.catalog.destinations))
+        self.destination_query.trace_add("write", lambda *args: self.schedule_search())
 
         ttk.Label(frame, text="Data wylotu (YYYY-MM-DD):").pack(pady=5)
         ttk.Entry(frame, textvariable=self.departure).pack()
@@ -130,6 +160,33 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
 
         ttk.Button(frame, text="Dalej", command=self.validate_destination).pack(pady=20)
 
+    def schedule_search(self):
+        #wyszukiwanie dopiero po 150 ms bez pisania
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(150, self.search_destinations)
+
+    def search_destinations(self):
+        self.search_job = None
+        query = self.destination_query.get()
+        if normalize(query) != normalize(self.destination.get()):
+            self.destination.set("")
+        if not normalize(query):
+            self.destination_list.set_items(list(self.catalog.destinations))
+            return
+        if not self.destination_index.done():
+            self.search_job = self.after(50, self.search_destinations)      #indeks jeszcze sie buduje
+            return
+        matches = self.destination_index.result().search(query, 200)
+        self.destination_list.set_items(matches)
+        if matches and normalize(matches[0]) == normalize(query):
+            self.destination.set(matches[0])
+
+    def select_destination(self, name):
+        self.destination.set(name)
+        if self.destination_query.get() != name:
+            self.destination_query.set(name)
+
     def validate_destination(self):
         if not self.destination.get():
             messagebox.showerror("Błąd", "Wybierz miejsce docelowe.")
@@ -137,31 +194,35 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         if not self.departure.get() or not self.return_date.get():
             messagebox.showerror("Błąd", "Wprowadź daty wylotu i powrotu.")
             return
-        if not self.is_valid_date_format(self.departure.get()) or not self.is_valid_date_format(self.return_date.get()):
-            messagebox.showerror("Błąd formatu", "Wprowadź daty w formacie YYYY-MM-DD.")
-            return
         try:
-            departure_date = datetime.strptime(self.departure.get(), "%Y-%m-%d").date()
-            return_date = datetime.strptime(self.return_date.get(), "%Y-%m-%d").date()
-            if return_date < departure_date:
-                messagebox.showerror("Błąd daty", "Data powrotu nie może być wcześniejsza niż data wylotu.")
-                return
+            departure_date = parse_date(self.departure.get())
+            return_date = parse_date(self.return_date.get())
         except ValueError:
-            messagebox.showerror("Błąd", "Nieprawidłowa data.")
+            messagebox.showerror("Błąd formatu", "Wprowadź daty w formacie YYYY-MM-DD.")
+            return
+        if return_date < departure_date:
+            messagebox.showerror("Błąd daty", "Data powrotu nie może być wcześniejsza niż data wylotu.")
             return
         self.choose_transport()
 
     def choose_transport(self):
-        self.clear_frame()
-        frame = ttk.Frame(self)
-        frame.pack(expand=True)
-
+        self.show_screen("transport", self.build_transport_screen)
+        if not self.aggregator:
+            self.airline_combo.config(values=self.bookable_airlines(self.catalog.airlines))
+        self.start_fare_stream()
+        if self.airline.get():
+            self.update_flight_price()
+        else:
+            self.flight_price_label.config(text="Cena lotu: -")
+
+    def build_transport_screen(self, frame):
         ttk.Label(frame, text="Wybierz linię lotniczą:").pack(pady=5)
-        airline_combo = ttk.Combobox(frame, textvariable=self.airline, values=list(self.airlines.keys()), state="readonly")
+        airline_combo = ttk.Combobox(frame, textvariable=self.airline, state="readonly")
         airline_combo.pack()
+        self.airline_combo = airline_combo
 
         ttk.Label(frame, text="Wybierz miejsce w samolocie:").pack(pady=5)
-        seat_combo = ttk.Combobox(frame, textvariable=self.seat, values=["Okno", "Środek", "Przejście"], state="readonly")
+        seat_combo = ttk.Combobox(frame, textvariable=self.seat, values=SEATS, state="readonly")
         seat_combo.pack()
 
         self.flight_price_label = ttk.Label(frame, text="Cena lotu: -")
@@ -176,10 +237,87 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         ttk.Button(button_frame, text="Wróć", command=self.choose_destination).grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Dalej", command=self.validate_transport).grid(row=0, column=1, padx=5)
 
+    def start_fare_stream(self):
+        #ceny od dostawcow doplywaja w tle, lista linii uzupelniana co 50 ms
+        key = (self.destination.get(), self.departure.get())
+        if not self.aggregator or key == self.fare_key:
+            return
+        self.fare_key = key
+        self.live_fares = {}
+        self.airline_combo.config(values=[])
+        results = self.fare_results = queue.Queue()
+        destination, day = key
+
+        async def pump():
+            try:
+                async for item in self.aggregator.stream(destination, day):
+                    results.put(item)
+            finally:
+                results.put(None)
+
+        self.background.submit(pump())
+        self.after(50, self.drain_fares, results)
+
+    def drain_fares(self, results):
+        if results is not self.fare_results or not self.airline_combo.winfo_exists():
+            return
+        changed = False
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                self.after(50, self.drain_fares, results)
+                break
+            if item is None:
+                break
+            _, quotes, _ = item
+            for airline, price in (quotes or {}).items():
+                if airline not in self.live_fares or price < self.live_fares[airline]:
+                    self.live_fares[airline] = price
+                    changed = True
+        if changed:
+            self.airline_combo.config(values=self.bookable_airlines(sorted(self.live_fares, key=self.live_fares.get)))
+            self.update_flight_price()
+
+    def bookable_airlines(self, airlines):
+        if not self.flight_availability:
+            return list(airlines)
+        free = set(self.flight_availability.bookable(self.destination.get(), self.departure.get(),
+                                                     self.return_date.get()))
+        return [a for a in airlines if a in free]
+
+    def bookable_hotels(self, hotels):
+        if not self.hotel_availability:
+            return hotels
+        free = set(self.hotel_availability.bookable(self.departure.get(), self.return_date.get()))
+        return [h for h in hotels if h in free]
+
+    def hold_inventory(self, holds):
+        #rezerwacja miejsca i pokoju; przy niepowodzeniu confirm_trip zwalnia holds
+        if self.seats:
+            seat_map = self.seats.seat_map(self.airline.get(), self.destination.get(), self.departure.get())
+            hold = seat_map.hold(self.seat.get())
+            holds.append((seat_map, hold))
+            self.trip.transport.seat = hold.label
+        if self.flight_availability:
+            holds.append((self.flight_availability, self.flight_availability.hold_seats(
+                self.airline.get(), self.destination.get(), self.departure.get(), self.return_date.get())))
+        if self.hotel_availability:
+            holds.append((self.hotel_availability, self.hotel_availability.hold_stay(
+                self.hotel_choice.get(), self.departure.get(), self.return_date.get())))
+
+    def flight_price(self, default=0):
+        if self.airline.get() in self.live_fares:
+            return self.live_fares[self.airline.get()]
+        return self.catalog.flight_price(self.airline.get(), self.destination.get(), self.departure.get(),
+                                         self.seat.get(), default)
+
+    def hotel_price(self, default=0):
+        return self.catalog.hotel_price(self.hotel_choice.get(), self.destination.get(), self.departure.get(), default)
+
     def update_flight_price(self):
-        airline = self.airline.get()
-        price = self.airlines.get(airline, "-")
-        self.flight_price_label.config(text=f"Cena lotu: {price} zł")
+        price = self.flight_price("-")
+        self.flight_price_label.config(text=f"Cena lotu: {format_price(price)}")
 
     def validate_transport(self):
         if not self.airline.get():
@@ -191,13 +329,26 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         self.choose_hotel()
 
     def choose_hotel(self):
-        self.clear_frame()
-        frame = ttk.Frame(self)
-        frame.pack(expand=True)
-
-        ttk.Label(frame, text="Wybierz hotel:").pack(pady=5)
-        hotel_combo = ttk.Combobox(frame, textvariable=self.hotel_choice, values=list(self.hotels.keys()), state="readonly")
+        self.show_screen("hotel", self.build_hotel_screen)
+        #tylko hotele mieszczace sie w budzecie, w cenach tej trasy i dnia
+        hotels = affordable_hotels(self.budget, self.flight_price(), self.catalog, self.destination.get(),
+                                   self.departure.get())
+        hotels = self.bookable_hotels(hotels)
+        self.hotel_label.config(text="Wybierz hotel:" if hotels else "Brak hoteli w budżecie")
+        self.hotel_combo.config(values=hotels)
+        if self.hotel_choice.get() not in hotels:
+            self.hotel_choice.set("")
+        if self.hotel_choice.get():
+            self.update_total_price()
+        else:
+            self.total_price_label.config(text="Cena całkowita: -")
+
+    def build_hotel_screen(self, frame):
+        self.hotel_label = ttk.Label(frame, text="Wybierz hotel:")
+        self.hotel_label.pack(pady=5)
+        hotel_combo = ttk.Combobox(frame, textvariable=self.hotel_choice, state="readonly")
         hotel_combo.pack()
+        self.hotel_combo = hotel_combo
 
         ttk.Label(frame, text="Metoda płatności:").pack(pady=5)
         payment_combo = ttk.Combobox(frame, textvariable=self.selected_payment, values=["Karta", "Gotówka"], state="readonly")
@@ -217,43 +368,75 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         ttk.Button(button_frame, text="Zaplanuj podróż", command=self.confirm_trip).grid(row=0, column=2, padx=5)
 
     def update_total_price(self):
-        hotel_name = self.hotel_choice.get()
-        hotel_price = self.hotels.get(hotel_name, 0)
-        flight_price = self.airlines.get(self.airline.get(), 0)
-        total = flight_price + hotel_price
-        self.total_price_label.config(text=f"Cena całkowita: {total} zł")
+        total = money_total([self.flight_price(), self.hotel_price()])
+        self.total_price_label.config(text=f"Cena całkowita: {format_price(total)}")
 
     def confirm_trip(self):
         self.trip.destination = self.destination.get()
         self.trip.departure_date = self.departure.get()
         self.trip.return_date = self.return_date.get()
 
-        flight_price = self.airlines.get(self.airline.get(), 0)
-        self.trip.transport = Flight(price=flight_price, airline=self.airline.get(), seat=self.seat.get())
+        self.trip.transport = Flight(price=self.flight_price(), airline=self.airline.get(), seat=self.seat.get())
 
-        hotel_price = self.hotels.get(self.hotel_choice.get(), 0)
-        hotel = Hotel(self.hotel_choice.get(), hotel_price)
+        hotel = Hotel(self.hotel_choice.get(), self.hotel_price())
         self.trip.hotel = hotel
 
+        holds = []
+        reservation = None
         try:
-            self.trip.confirm()
-            if self.selected_payment.get() == "Karta":
-                payment = CreditCardPayment()
-            else:
-                payment = CashPayment()
-            payment_msg = payment.pay(self.trip.total_cost())
-
-            self.budget -= self.trip.total_cost()
-            self.update_budget_label()
-
-            messagebox.showinfo("Sukces", f"Podróż zaplanowana pomyślnie!\n{payment_msg}")
-            self.reset_all()
-            self.build_trip()
-        except OverBudgetException as e:
+            self.hold_inventory(holds)
+            #rezerwacja budzetu jest atomowa: sprawdzenie i pobranie pod jednym zamkiem
+            reservation = self.budgets.reserve(self.account, self.trip.total_cost())
+            for index, hold in holds:
+                index.commit(hold)
+            trip_id = self.ledger.record(self.trip, self.selected_payment.get(), PENDING) if self.ledger else None
+        except BaseException as e:
+            #kazdy blad (tez np. sqlite3.Error) zwalnia budzet i miejsca
+            if reservation:
+                self.budgets.release(reservation)
+            for index, hold in holds:
+                index.release(hold)
+            if not isinstance(e, (OverBudgetException, UnavailableException, NoSeatException)):
+                raise
             messagebox.showerror("Błąd", str(e))
+            return
+        self.update_budget_label()
+
+        #platnosc rozliczana w tle, paczkami; rezerwacja budzetu zatwierdzana dopiero po rozliczeniu
+        payment = Payment(uuid.uuid4().hex, payment_for(self.selected_payment.get()), self.trip.total_cost())
+        self.payment_label.config(text="Płatność w trakcie rozliczania...")
+        self.watch_payment(self.background.submit(self.settlement.pay(payment)), reservation, holds, trip_id)
+
+        messagebox.showinfo("Sukces", "Podróż zaplanowana pomyślnie!")
+        self.reset_all()
+        self.build_trip()
+
+    def watch_payment(self, future, reservation, holds, trip_id):
+        if not future.done():
+            self.after(100, self.watch_payment, future, reservation, holds, trip_id)
+            return
+        try:
+            message = future.result()
+        except BaseException as e:
+            #kazdy blad (odmowa, anulowanie, zla odpowiedz strategii) anuluje podroz:
+            #budzet i miejsca wracaja, wpis w bazie oznaczony jako failed
+            self.budgets.release(reservation)
+            for index, hold in holds:
+                index.release(hold)
+            if trip_id is not None:
+                self.ledger.set_status(trip_id, FAILED)
+            self.update_budget_label()
+            self.payment_label.config(text="")
+            messagebox.showerror("Błąd płatności", str(e) or type(e).__name__)
+            return
+        self.budgets.commit(reservation)
+        if trip_id is not None:
+            self.ledger.set_status(trip_id, PAID)
+        self.payment_label.config(text=message)
 
     def reset_all(self):
         self.destination.set("")
+        self.destination_query.set("")
         self.departure.set("")
         self.return_date.set("")
         self.airline.set("")
@@ -261,14 +444,20 @@ class TravelPlannerApp(tk.Tk, TripBuilderTemplate):
         self.hotel_choice.set("")
         self.selected_payment.set("")
 
+    def destroy(self):
+        if self.heartbeat:
+            self.heartbeat.stop()
+        if self.snapshot_path:
+            save_snapshot(self.snapshot_path, self.snapshot())
+        super().destroy()
+
     @staticmethod
     def is_valid_date_format(date_str):
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
+        return is_valid_date_format(date_str)
 
 if __name__ == "__main__":
-    app = TravelPlannerApp()
-    app.mainloop()
+    metrics_path = os.environ.get("PLANNER_METRICS")        #np. planner.prom albo planner.json
+    with TripLedger("trips.db", initial_budget=3000) as ledger:
+        app = TravelPlannerApp(ledger=ledger, seats=SeatInventory(), metrics=Metrics() if metrics_path else None,
+                               metrics_path=metrics_path, snapshot_path="trips.session")
+        app.mainloop()
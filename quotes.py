@@ -0,0 +1,86 @@
+import numpy as np
+
+from engine import PriceCatalog, SEATS
+from money import Money, to_money, default_converter
+
+#wycena hurtowa: wszystkie kombinacje linia x miejsce x hotel dla N zapytan naraz
+class BatchQuote:
+    def __init__(self, requests, airlines, seats, hotels, totals, within_budget):
+        self.requests = requests
+        self.airlines = airlines
+        self.seats = seats
+        self.hotels = hotels
+        self.totals = totals                    #ksztalt (N, linie, miejsca, hotele)
+        self.within_budget = within_budget      #maska z Trip.confirm
+
+    def affordable(self, index):
+        for a, s, h in np.argwhere(self.within_budget[index]):
+            yield self.airlines[a], self.seats[s], self.hotels[h], int(self.totals[index, a, s, h])
+
+    def cheapest(self, index):
+        costs = np.where(self.within_budget[index], self.totals[index], np.iinfo(self.totals.dtype).max)
+        a, s, h = np.unravel_index(np.argmin(costs), costs.shape)
+        if not self.within_budget[index, a, s, h]:
+            return None
+        return self.airlines[a], self.seats[s], self.hotels[h], int(self.totals[index, a, s, h])
+
+def _prices(values, currency, converter):
+    #ceny w groszach/centach waluty `currency`, przeliczane paczkami po walucie zrodlowej
+    values = [to_money(v) for v in values]
+    return converter.convert_many([v.minor for v in values], [v.currency for v in values], currency)
+
+def _route(request):
+    #zapytanie: slownik albo obiekt (np. Trip) z destination i departure_date
+    if isinstance(request, dict):
+        return request.get("destination"), request.get("departure_date")
+    return getattr(request, "destination", None), getattr(request, "departure_date", None)
+
+def _vector(values, currency, converter):
+    if currency is not None:
+        return _prices(values, currency, converter)
+    if any(isinstance(v, Money) for v in values):
+        raise ValueError("Cennik zawiera ceny w walutach; podaj currency dla quote_batch")
+    return np.array(values, dtype=np.int64)
+
+def quote_batch(requests, budget, catalog=None, seat_prices=None, currency=None, converter=None):
+    #ceny przez flight_price/hotel_price dostawcy, jak w kreatorze i serwisie: trasa, dzien i miejsce
+    catalog = catalog or PriceCatalog()
+    requests = list(requests)
+    airlines = list(catalog.airlines)
+    hotels = list(catalog.hotels)
+    seats = list(SEATS)
+    seat_prices = seat_prices or {}
+    converter = converter or default_converter()
+
+    #jedno zapytanie do dostawcy na kazda rozna pare (cel, dzien)
+    routes = {}
+    rows = np.empty(len(requests), dtype=np.intp)
+    for n, request in enumerate(requests):
+        rows[n] = routes.setdefault(_route(request), len(routes))
+    flights, stays = [], []
+    for destination, day in routes:
+        flights += [catalog.flight_price(a, destination, day, s) for a in airlines for s in seats]
+        stays += [catalog.hotel_price(h, destination, day) for h in hotels]
+    flight_prices = _vector(flights, currency, converter).reshape(len(routes), len(airlines), len(seats))
+    hotel_prices = _vector(stays, currency, converter).reshape(len(routes), len(hotels))
+    seat_surcharge = _vector([seat_prices.get(s, 0) for s in seats], currency, converter)
+    if currency is not None:
+        #sumy sa w jednostkach drobnych, wiec budzet tez
+        if isinstance(budget, (Money, int)):
+            budget = _prices([budget], currency, converter)[0]
+        else:
+            budget = _prices(list(budget), currency, converter)
+
+    combo = (flight_prices[:, :, :, None] + seat_surcharge[None, None, :, None] +
+             hotel_prices[:, None, None, :])
+    totals = combo[rows]
+
+    budgets = np.asarray(budget, dtype=np.int64)
+    if budgets.ndim == 0:
+        within_budget = totals <= budgets
+    else:
+        if budgets.shape != (len(requests),):
+            raise ValueError("Budżet musi być liczbą albo tablicą o długości liczby zapytań")
+        within_budget = totals <= budgets[:, None, None, None]
+
+    return BatchQuote(requests, airlines, seats, hotels, totals, within_budget)
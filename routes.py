@@ -0,0 +1,132 @@
+import heapq
+from array import array
+from bisect import bisect_left
+
+from engine import Flight, Trip
+
+class NoRouteException(Exception):
+    pass
+
+class Leg(Flight):
+    __slots__ = ("origin", "destination", "departure", "arrival")
+
+    def __init__(self, price, airline, origin, destination, departure, arrival, seat=""):
+        super().__init__(price, airline, seat)
+        self.origin = origin
+        self.destination = destination
+        self.departure = departure          #minuty od poczatku okresu rozkladu
+        self.arrival = arrival
+
+    def __repr__(self):
+        return f"Leg({self.airline} {self.origin}->{self.destination}, {self.price} zł)"
+
+#siec polaczen w formacie CSR: odcinki z lotniska i leza w [offsets[i], offsets[i + 1]), posortowane po godzinie wylotu
+class FlightNetwork:
+    def __init__(self, legs):
+        self.airports = []
+        self.airport_index = {}
+        self.carriers = []
+        carrier_index = {}
+        rows = []
+        for origin, destination, carrier, price, departure, arrival in legs:
+            if carrier not in carrier_index:
+                carrier_index[carrier] = len(self.carriers)
+                self.carriers.append(carrier)
+            rows.append((self._airport(origin), departure, self._airport(destination), arrival, price,
+                         carrier_index[carrier]))
+        rows.sort()
+
+        self.offsets = array("i", [0]) * (len(self.airports) + 1)
+        for row in rows:
+            self.offsets[row[0] + 1] += 1
+        for i in range(len(self.airports)):
+            self.offsets[i + 1] += self.offsets[i]
+        self.departures = array("i", (r[1] for r in rows))
+        self.targets = array("i", (r[2] for r in rows))
+        self.arrivals = array("i", (r[3] for r in rows))
+        self.prices = array("q", (r[4] for r in rows))
+        self.leg_carriers = array("h", (r[5] for r in rows))
+
+    def _airport(self, code):
+        index = self.airport_index.get(code)
+        if index is None:
+            index = self.airport_index[code] = len(self.airports)
+            self.airports.append(code)
+        return index
+
+    def __len__(self):
+        return len(self.prices)
+
+    def _legs_from(self, airport, earliest, latest):
+        lo, hi = self.offsets[airport], self.offsets[airport + 1]
+        start = bisect_left(self.departures, earliest, lo, hi)
+        for leg in range(start, hi):
+            if self.departures[leg] > latest:
+                break
+            yield leg
+
+    def leg(self, index):
+        origin = bisect_left(self.offsets, index + 1) - 1
+        return Leg(self.prices[index], self.carriers[self.leg_carriers[index]], self.airports[origin],
+                   self.airports[self.targets[index]], self.departures[index], self.arrivals[index])
+
+    def cheapest_route(self, origin, destination, earliest=0, latest=None, max_stops=2,
+                       min_connection=45, max_connection=24 * 60):
+        #Dijkstra po odcinkach; stan = (odcinek, liczba przesiadek), koszt = suma cen
+        source = self.airport_index.get(origin)
+        target = self.airport_index.get(destination)
+        if source is None or target is None:
+            raise NoRouteException(f"Nieznane lotnisko: {origin if source is None else destination}")
+        latest = earliest + 24 * 60 if latest is None else latest
+
+        heap = [(self.prices[leg], leg, 0) for leg in self._legs_from(source, earliest, latest)]
+        heapq.heapify(heap)
+        best = {}
+        parent = {}
+        bound = float("inf")            #najtansze znane dotarcie do celu
+        for cost, leg, stops in heap:
+            best[leg, stops] = cost
+            parent[leg, stops] = None
+            if self.targets[leg] == target:
+                bound = min(bound, cost)
+        while heap:
+            cost, leg, stops = heapq.heappop(heap)
+            if best.get((leg, stops)) != cost:
+                continue
+            airport = self.targets[leg]
+            if airport == target:
+                return cost, self._path(parent, (leg, stops))
+            if stops == max_stops:
+                continue
+            arrival = self.arrivals[leg]
+            last = stops + 1 == max_stops
+            for nxt in self._legs_from(airport, arrival + min_connection, arrival + max_connection):
+                if last and self.targets[nxt] != target:
+                    continue
+                state = (nxt, stops + 1)
+                new_cost = cost + self.prices[nxt]
+                if new_cost > bound:
+                    continue
+                #odcinek osiagniety taniej z mniejsza liczba przesiadek dominuje
+                if any(best.get((nxt, s), new_cost + 1) <= new_cost for s in range(stops + 2)):
+                    continue
+                best[state] = new_cost
+                parent[state] = (leg, stops)
+                if self.targets[nxt] == target:
+                    bound = min(bound, new_cost)
+                heapq.heappush(heap, (new_cost, nxt, stops + 1))
+        raise NoRouteException(f"Brak połączenia {origin} -> {destination}")
+
+    def _path(self, parent, state):
+        legs = []
+        while state is not None:
+            legs.append(self.leg(state[0]))
+            state = parent[state]
+        return legs[::-1]
+
+def multi_leg_trip(network, origin, destination, budget, hotel=None, **search):
+    _, legs = network.cheapest_route(origin, destination, **search)
+    trip = Trip(destination, budget)
+    trip.legs = list(legs)
+    trip.hotel = hotel
+    return trip
@@ -0,0 +1,70 @@
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+#litery, ktore NFKD nie rozklada na litere bazowa + znak diakrytyczny
+_EXTRA = str.maketrans({"ł": "l", "Ł": "l", "ø": "o", "Ø": "o", "đ": "d", "Đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text.translate(_EXTRA))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold().strip()
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+#indeks prefiksowy (posortowane slowa + bisect) i trigramowy dla literowek
+class DestinationIndex:
+    def __init__(self, names, weights=None):
+        self.names = list(names)
+        self.weights = weights or {}
+        self._keys = [normalize(n) for n in self.names]
+        self._words = sorted((word, i) for i, key in enumerate(self._keys) for word in set(key.split()) | {key})
+        self._words_only = [w for w, _ in self._words]
+        postings = {}
+        for i, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(i)
+        self._trigrams = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._lengths = np.array([len(k) for k in self._keys], dtype=np.float32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _rank(self, i):
+        return -self.weights.get(self.names[i], 0), len(self._keys[i]), self._keys[i]
+
+    def _prefix(self, query, limit):
+        found = set()
+        words = self._words
+        #po indeksach, bez kopiowania ogona listy przy kazdym znaku
+        for pos in range(bisect_left(self._words_only, query), len(words)):
+            word, i = words[pos]
+            if not word.startswith(query):
+                break
+            found.add(i)
+            if len(found) >= limit * 4:
+                break
+        return sorted(found, key=self._rank)
+
+    def _fuzzy(self, query, skip, limit):
+        grams = trigrams(query)
+        lists = [self._trigrams[g] for g in grams if g in self._trigrams]
+        if not lists:
+            return []
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.names))
+        candidates = np.flatnonzero(counts >= max(1, len(grams) // 2))
+        #podobienstwo: wspolne trigramy wzgledem dlugosci obu napisow
+        score = counts[candidates] / (len(grams) + self._lengths[candidates])
+        best = candidates[np.argsort(-score, kind="stable")[:limit + len(skip)]]
+        return [int(i) for i in best if int(i) not in skip][:limit]
+
+    def search(self, query, limit=10):
+        query = normalize(query)
+        if not query:
+            return []
+        result = self._prefix(query, limit)[:limit]
+        if len(result) < limit and len(query) >= 3:
+            result += self._fuzzy(query, set(result), limit - len(result))
+        return [self.names[i] for i in result]
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import threading
+import time
+
+WINDOW, MIDDLE, AISLE = "Okno", "Środek", "Przejście"
+ECONOMY, BUSINESS = "economy", "business"
+
+class NoSeatException(Exception):
+    pass
+
+class SeatHold:
+    def __init__(self, flight, seat, label, token, expires):
+        self.flight = flight
+        self.seat = seat
+        self.label = label
+        self.token = token
+        self.expires = expires
+
+#mapa miejsc jako bitsety (int): bit i = miejsce i; wolne, zajete i maski klas/pozycji
+class SeatMap:
+    def __init__(self, rows, layout="ABC DEF", business_rows=0, flight=None, clock=time.monotonic):
+        self.flight = flight
+        self.clock = clock
+        blocks = layout.split()
+        letters = "".join(blocks)
+        self.positions = {}
+        for b, block in enumerate(blocks):
+            for i, letter in enumerate(block):
+                outer = (b == 0 and i == 0) or (b == len(blocks) - 1 and i == len(block) - 1)
+                edge = i == 0 or i == len(block) - 1
+                self.positions[letter] = WINDOW if outer else AISLE if edge else MIDDLE
+        self.labels = [f"{row}{letter}" for row in range(1, rows + 1) for letter in letters]
+        self.index = {label: i for i, label in enumerate(self.labels)}
+
+        self.position_masks = {WINDOW: 0, MIDDLE: 0, AISLE: 0}
+        self.class_masks = {ECONOMY: 0, BUSINESS: 0}
+        for i, label in enumerate(self.labels):
+            row, letter = int(label[:-1]), label[-1]
+            self.position_masks[self.positions[letter]] |= 1 << i
+            self.class_masks[BUSINESS if row <= business_rows else ECONOMY] |= 1 << i
+
+        self.free = (1 << len(self.labels)) - 1
+        self.holds = {}                 #miejsce -> (token, wygasa)
+        self.sold = {}                  #miejsce -> token, zeby mozna bylo wycofac sprzedaz
+        self._expiry = []               #kopiec (wygasa, miejsce, token)
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            _, seat, token = heapq.heappop(self._expiry)
+            if self.holds.get(seat, (None,))[0] == token:
+                del self.holds[seat]
+                self.free |= 1 << seat
+
+    def _take(self, seat, ttl):
+        now = self.clock()
+        token = next(self._tokens)
+        expires = now + ttl
+        self.free &= ~(1 << seat)
+        self.holds[seat] = (token, expires)
+        heapq.heappush(self._expiry, (expires, seat, token))
+        return SeatHold(self.flight, seat, self.labels[seat], token, expires)
+
+    def free_seats(self, position=None, seat_class=None):
+        with self._lock:
+            self._expire(self.clock())
+            mask = self.free
+        if position:
+            mask &= self.position_masks[position]
+        if seat_class:
+            mask &= self.class_masks[seat_class]
+        return mask.bit_count()
+
+    def hold(self, position=None, seat_class=ECONOMY, ttl=600):
+        with self._lock:
+            self._expire(self.clock())
+            mask = self.free & self.class_masks[seat_class]
+            if position:
+                mask &= self.position_masks[position]
+            if not mask:
+                raise NoSeatException(f"Brak wolnych miejsc: {position or seat_class}")
+            return self._take((mask & -mask).bit_length() - 1, ttl)       #najnizszy ustawiony bit
+
+    def hold_seat(self, label, ttl=600):
+        seat = self.index[label]
+        with self._lock:
+            self._expire(self.clock())
+            if not self.free >> seat & 1:
+                raise NoSeatException(f"Miejsce {label} jest zajęte")
+            return self._take(seat, ttl)
+
+    def commit(self, hold):
+        with self._lock:
+            self._expire(self.clock())
+            if self.holds.get(hold.seat, (None,))[0] != hold.token:
+                raise NoSeatException(f"Rezerwacja miejsca {hold.label} wygasła")
+            del self.holds[hold.seat]                   #miejsce zostaje zajete na stale
+            self.sold[hold.seat] = hold.token
+        return hold.label
+
+    def release(self, hold):
+        #zwalnia trzymane albo juz sprzedane miejsce (wycofanie rezerwacji)
+        with self._lock:
+            if self.holds.get(hold.seat, (None,))[0] == hold.token:
+                del self.holds[hold.seat]
+                self.free |= 1 << hold.seat
+            elif self.sold.get(hold.seat) == hold.token:
+                del self.sold[hold.seat]
+                self.free |= 1 << hold.seat
+
+#mapy miejsc tworzone przy pierwszym zapytaniu o dany lot (linia + trasa + dzien)
+class SeatInventory:
+    def __init__(self, rows=30, layout="ABC DEF", business_rows=0, clock=time.monotonic):
+        self.rows = rows
+        self.layout = layout
+        self.business_rows = business_rows
+        self.clock = clock
+        self.maps = {}
+        self._lock = threading.Lock()
+
+    def seat_map(self, airline, destination, day):
+        key = (airline, destination, day)
+        with self._lock:
+            if key not in self.maps:
+                self.maps[key] = SeatMap(self.rows, self.layout, self.business_rows, key, self.clock)
+            return self.maps[key]
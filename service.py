@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import re
+import secrets
+import time
+
+from engine import TripBuilderTemplate, Trip, Flight, Hotel, SEATS, PAYMENT_METHODS, OverBudgetException, parse_date, payment_for
+from catalog import CachedCatalogProvider
+from optimizer import affordable_hotels
+from budget import BudgetLedger
+from money import to_minor, to_json
+
+class BookingError(ValueError):
+    pass
+
+class SessionNotFound(KeyError):
+    pass
+
+def text_field(body, name):
+    #pola z JSON: brak albo tekst; lista/liczba/obiekt to blad klienta, nie wyjatek w serwerze
+    value = body.get(name)
+    if value is not None and not isinstance(value, str):
+        raise BookingError(f"Pole {name} musi być tekstem")
+    return value
+
+#ten sam szablon co TravelPlannerApp, tylko kroki przyjmuja dane zamiast czytac StringVar
+class BookingSession(TripBuilderTemplate):
+    def __init__(self, session_id, catalog, budgets, account, ledger=None):
+        self.id = session_id
+        self.catalog = catalog
+        self.budgets = budgets
+        self.account = account
+        self.ledger = ledger
+        self.trip = Trip("", budgets.balance(account))
+        self.step = "destination"
+        self.airline = self.seat = self.hotel_name = self.payment = None
+        self.confirmed = False
+
+    def choose_destination(self, destination=None, departure_date=None, return_date=None):
+        if destination is None:
+            return {"destinations": list(self.catalog.destinations)}
+        if not destination or not departure_date or not return_date:
+            raise BookingError("Wybierz miejsce docelowe oraz daty wylotu i powrotu.")
+        try:
+            departure, back = parse_date(departure_date), parse_date(return_date)
+        except (TypeError, ValueError):
+            raise BookingError("Wprowadź daty w formacie YYYY-MM-DD.") from None
+        if back < departure:
+            raise BookingError("Data powrotu nie może być wcześniejsza niż data wylotu.")
+        self.trip.destination = destination
+        self.trip.departure_date = departure_date
+        self.trip.return_date = return_date
+        self.step = "transport"
+        return self.choose_transport()
+
+    def choose_transport(self, airline=None, seat=None):
+        self._require("transport", "hotel", "confirm")
+        if airline is None:
+            return {"airlines": {a: self._flight_price(a) for a in self.catalog.airlines}, "seats": SEATS}
+        if airline not in self.catalog.airlines:
+            raise BookingError("Wybierz linię lotniczą.")
+        if seat not in SEATS:
+            raise BookingError("Wybierz miejsce w samolocie.")
+        self.airline, self.seat = airline, seat
+        self.trip.transport = Flight(price=self._flight_price(airline, seat), airline=airline, seat=seat)
+        self.step = "hotel"
+        return self.choose_hotel()
+
+    def choose_hotel(self, hotel=None, payment=None):
+        self._require("hotel", "confirm")
+        if hotel is None:
+            budget = self.budgets.balance(self.account)
+            hotels = affordable_hotels(budget, self.trip.transport.price, self.catalog, self.trip.destination,
+                                       self.trip.departure_date)
+            return {"hotels": {h: self._hotel_price(h) for h in hotels}, "payments": list(PAYMENT_METHODS)}
+        if hotel not in self.catalog.hotels:
+            raise BookingError("Wybierz hotel.")
+        if payment not in PAYMENT_METHODS:
+            raise BookingError("Wybierz metodę płatności.")
+        self.hotel_name, self.payment = hotel, payment
+        self.trip.hotel = Hotel(hotel, self._hotel_price(hotel))
+        self.step = "confirm"
+        return self.quote()
+
+    def quote(self):
+        total = self.trip.total_cost()
+        return {"total": total, "within_budget": to_minor(total) <= to_minor(self.budgets.balance(self.account))}
+
+    def confirm_trip(self):
+        self._require("confirm")
+        total = self.trip.total_cost()
+        reservation = self.budgets.reserve(self.account, total)
+        try:
+            message = payment_for(self.payment).pay(total)
+            if self.ledger:
+                self.ledger.record(self.trip, self.payment)
+        except BaseException:
+            self.budgets.release(reservation)
+            raise
+        self.budgets.commit(reservation)
+        self.confirmed = True
+        self.step = "done"
+        return {"total": total, "payment": message, "remaining": self.budgets.balance(self.account)}
+
+    def _require(self, *steps):
+        if self.step not in steps:
+            raise BookingError(f"Krok niedostępny na etapie: {self.step}")
+
+    def _flight_price(self, airline, seat=None):
+        #jak w kreatorze: cena zalezy tez od miejsca, lista linii przed wyborem miejsca pokazuje cene bazowa
+        return self.catalog.flight_price(airline, self.trip.destination, self.trip.departure_date, seat)
+
+    def _hotel_price(self, hotel):
+        return self.catalog.hotel_price(hotel, self.trip.destination, self.trip.departure_date)
+
+#sesje w pamieci; kazde uzycie przedluza waznosc o ttl
+class SessionStore:
+    def __init__(self, ttl=900.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = {}
+
+    def add(self, session):
+        self.sessions[session.id] = (session, self.clock() + self.ttl)
+
+    def get(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None or entry[1] <= self.clock():
+            self.sessions.pop(session_id, None)
+            raise SessionNotFound(session_id)
+        self.sessions[session_id] = (entry[0], self.clock() + self.ttl)
+        return entry[0]
+
+    def remove(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def sweep(self):
+        now = self.clock()
+        expired = [sid for sid, (_, expires) in self.sessions.items() if expires <= now]
+        for sid in expired:
+            del self.sessions[sid]
+        return len(expired)
+
+STATUS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+          409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 64 * 1024
+
+class BookingService:
+    def __init__(self, catalog=None, budgets=None, ledger=None, session_ttl=900.0):
+        self.catalog = CachedCatalogProvider(catalog)
+        self.budgets = budgets or BudgetLedger({"default": 3000})
+        self.ledger = ledger
+        self.store = SessionStore(session_ttl)
+        self._ids = itertools.count(1)
+        self.routes = [
+            ("POST", re.compile(r"/sessions"), self.create_session),
+            ("POST", re.compile(r"/sessions/(\w+)/destination"), self.step_destination),
+            ("POST", re.compile(r"/sessions/(\w+)/transport"), self.step_transport),
+            ("POST", re.compile(r"/sessions/(\w+)/hotel"), self.step_hotel),
+            ("GET", re.compile(r"/sessions/(\w+)/quote"), self.get_quote),
+            ("POST", re.compile(r"/sessions/(\w+)/confirm"), self.confirm),
+            ("DELETE", re.compile(r"/sessions/(\w+)"), self.delete_session),
+        ]
+
+    def create_session(self, body):
+        account = text_field(body, "account") or "default"
+        if account not in self.budgets.accounts:
+            raise BookingError(f"Nieznane konto: {account}")
+        session = BookingSession(f"{next(self._ids):x}{secrets.token_hex(6)}", self.catalog, self.budgets,
+                                 account, self.ledger)
+        self.store.add(session)
+        return 201, {"session": session.id, "step": session.step, "options": session.choose_destination()}
+
+    def step_destination(self, body, session_id):
+        session = self.store.get(session_id)
+        options = session.choose_destination(text_field(body, "destination"), text_field(body, "departure_date"),
+                                             text_field(body, "return_date"))
+        return 200, {"step": session.step, "options": options}
+
+    def step_transport(self, body, session_id):
+        session = self.store.get(session_id)
+        options = session.choose_transport(text_field(body, "airline"), text_field(body, "seat"))
+        return 200, {"step": session.step, "options": options}
+
+    def step_hotel(self, body, session_id):
+        session = self.store.get(session_id)
+        quote = session.choose_hotel(text_field(body, "hotel"), text_field(body, "payment"))
+        return 200, {"step": session.step, "quote": quote}
+
+    def get_quote(self, body, session_id):
+        return 200, self.store.get(session_id).quote()
+
+    def confirm(self, body, session_id):
+        session = self.store.get(session_id)
+        result = session.confirm_trip()
+        self.store.remove(session_id)
+        return 200, result
+
+    def delete_session(self, body, session_id):
+        self.store.get(session_id)
+        self.store.remove(session_id)
+        return 200, {}
+
+    def dispatch(self, method, path, body):
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                if route_method != method:
+                    allowed = True
+                    continue
+                try:
+                    return handler(body, *match.groups())
+                except SessionNotFound:
+                    return 404, {"error": "Sesja nie istnieje albo wygasła"}
+                except OverBudgetException as e:
+                    return 409, {"error": str(e)}
+                except BookingError as e:
+                    return 400, {"error": str(e)}
+                except Exception:
+                    logging.getLogger(__name__).exception("Błąd obsługi %s %s", method, path)
+                    return 500, {"error": "Wewnętrzny błąd serwera"}
+        if allowed:
+            return 405, {"error": "Niedozwolona metoda"}
+        return 404, {"error": "Nie znaleziono"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                close = headers.get("connection", "").lower() == "close"
+                if length > MAX_BODY or length < 0:
+                    #ciala nie czytamy wcale; odpowiedz i zamkniecie polaczenia
+                    status, payload = 413, {"error": "Za duże żądanie"}
+                    close = True
+                else:
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                        if not isinstance(body, dict):
+                            raise ValueError
+                        status, payload = self.dispatch(method, target.split("?", 1)[0], body)
+                    except ValueError:
+                        status, payload = 400, {"error": "Nieprawidłowy JSON"}
+                data = json.dumps(payload, ensure_ascii=False, default=to_json).encode()
+                writer.write(f"HTTP/1.1 {status} {STATUS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n{'Connection: close' if close else 'Connection: keep-alive'}"
+                             f"\r\n\r\n".encode() + data)
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def sweep_sessions(self, interval=30.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.store.sweep()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        sweeper = asyncio.ensure_future(self.sweep_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwis rezerwacji podróży (HTTP/JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--budget", type=int, default=3000)
+    parser.add_argument("--session-ttl", type=float, default=900.0)
+    args = parser.parse_args()
+    service = BookingService(budgets=BudgetLedger({"default": args.budget}), session_ttl=args.session_ttl)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
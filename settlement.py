@@ -0,0 +1,133 @@
+import asyncio
+import inspect
+from collections import deque
+
+class Payment:
+    def __init__(self, key, strategy, amount):
+        self.key = key                  #klucz idempotencji: ta sama platnosc rozliczana raz
+        self.strategy = strategy
+        self.amount = amount
+        self.attempts = 0
+        self.error = None
+
+class SettlementFailed(Exception):
+    pass
+
+#kolejka rozliczen: ograniczona (backpressure), zapis paczkami, ponowienia i dead-letter
+class SettlementPipeline:
+    def __init__(self, batch_size=64, max_pending=1024, flush_interval=0.02, max_attempts=3, backoff=0.1,
+                 idempotency_window=600.0):
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.queue = None
+        self.idempotency_window = idempotency_window
+        self.results = {}               #klucz -> Future z komunikatem platnosci
+        self._settled = deque()         #(wygasa, klucz) w kolejnosci rozliczenia
+        self.dead_letters = []
+        self.batches = 0
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self.queue = asyncio.Queue(self.max_pending)
+            self._worker = asyncio.ensure_future(self._run())
+
+    def _evict(self, now):
+        #rozliczone klucze pamietane tylko przez idempotency_window sekund
+        while self._settled and self._settled[0][0] <= now:
+            _, key = self._settled.popleft()
+            self.results.pop(key, None)
+
+    def _done(self, key):
+        self._settled.append((asyncio.get_running_loop().time() + self.idempotency_window, key))
+
+    async def submit(self, payment):
+        self._ensure_worker()
+        self._evict(asyncio.get_running_loop().time())
+        future = self.results.get(payment.key)
+        if future is not None:
+            return future
+        future = self.results[payment.key] = asyncio.get_running_loop().create_future()
+        await self.queue.put(payment)                   #czeka, gdy kolejka pelna
+        return future
+
+    async def pay(self, payment):
+        return await asyncio.shield(await self.submit(payment))
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            groups = {}
+            for payment in batch:
+                groups.setdefault(type(payment.strategy), []).append(payment)
+            for payments in groups.values():
+                await self._settle(payments)
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _call(self, payments):
+        results = payments[0].strategy.settle(payments)
+        if inspect.isawaitable(results):
+            results = await results
+        results = list(results)
+        if len(results) != len(payments):
+            raise SettlementFailed(f"Oczekiwano {len(payments)} wyników rozliczenia, otrzymano {len(results)}")
+        return results
+
+    async def _settle(self, payments):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                results = await self._call(payments)
+            except Exception as e:
+                if len(payments) > 1:
+                    #blad calej paczki: dzielimy na polowy, az zostanie sama zla platnosc
+                    half = len(payments) // 2
+                    await asyncio.gather(self._settle(payments[:half]), self._settle(payments[half:]))
+                    return
+                results = [e]
+            self.batches += 1
+            retry = []
+            for p, result in zip(payments, results):
+                if isinstance(result, BaseException):
+                    p.attempts, p.error = attempt, result
+                    retry.append(p)
+                else:
+                    self.results[p.key].set_result(result)
+                    self._done(p.key)
+            #ponawiane tylko odrzucone platnosci
+            payments = retry
+            if not payments:
+                return
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        for p in payments:
+            self.dead_letters.append(p)
+            self.results[p.key].set_exception(SettlementFailed(f"Płatność {p.key} nieudana: {p.error}"))
+            self._done(p.key)
+
+    async def join(self):
+        if self.queue is not None:
+            await self.queue.join()
+
+    async def close(self):
+        await self.join()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
@@ -0,0 +1,130 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import PriceCatalog
+
+#parametry losowania: wahania cen (lognormalnie), sezon, drozsze i tansze miejsca docelowe, dlugosc pobytu
+class Scenario:
+    def __init__(self, catalog=None, trips=3, volatility=0.15, season=0.2, destination_spread=0.25,
+                 max_nights=1, seed=0):
+        catalog = catalog or PriceCatalog()
+        self.airline_prices = np.array(list(catalog.airlines.values()), dtype=np.float64)
+        self.hotel_prices = np.array(list(catalog.hotels.values()), dtype=np.float64)
+        self.destinations = list(catalog.destinations)
+        self.trips = trips
+        self.volatility = volatility
+        self.season = season
+        self.max_nights = max_nights
+        #mnozniki miejsc docelowych stale dla calej symulacji (to samo ziarno = te same miasta)
+        rng = np.random.default_rng(seed)
+        self.destination_factors = np.exp(rng.normal(0, destination_spread, len(self.destinations)))
+
+    def demand_cap(self):
+        #gorna granica histogramu kosztow; wszystko powyzej trafia do ostatniego kubelka
+        peak = (self.airline_prices.max() + self.hotel_prices.max() * self.max_nights) * self.trips
+        return int(peak * self.destination_factors.max() * (1 + self.season) * math.exp(4 * self.volatility)) + 1
+
+    def sample(self, rng, n):
+        #koszty (n, trips) w zlotowkach, kolejnosc jak kolejne Trip.confirm
+        shape = (n, self.trips)
+        airline = rng.integers(len(self.airline_prices), size=shape)
+        hotel = rng.integers(len(self.hotel_prices), size=shape)
+        destination = self.destination_factors[rng.integers(len(self.destinations), size=shape)]
+        day = rng.integers(365, size=shape)
+        season = 1 + self.season * np.cos(2 * np.pi * (day - 196) / 365)        #szczyt w lipcu
+        nights = rng.integers(1, self.max_nights + 1, size=shape)
+        noise = self.volatility
+        flight = self.airline_prices[airline] * np.exp(rng.normal(-noise ** 2 / 2, noise, shape))
+        stay = self.hotel_prices[hotel] * np.exp(rng.normal(-noise ** 2 / 2, noise, shape))
+        return np.rint((flight + stay * nights) * destination * season).astype(np.int64)
+
+def _simulate(args):
+    scenario, budgets, n, seed, cap = args
+    rng = np.random.default_rng(seed)
+    costs = scenario.sample(rng, n)
+    demand = costs.sum(axis=1)
+    result = {"n": n, "demand": np.bincount(np.minimum(demand, cap), minlength=cap + 1), "budgets": []}
+    for budget in budgets:
+        #kolejne potwierdzenia: odrzucona podroz nie zmniejsza budzetu, nastepna moze sie zmiescic
+        remaining = np.full(n, budget, dtype=np.int64)
+        rejected = np.zeros(n, dtype=np.int64)
+        for trip in range(scenario.trips):
+            cost = costs[:, trip]
+            ok = cost <= remaining
+            remaining -= np.where(ok, cost, 0)
+            rejected += ~ok
+        spent = budget - remaining
+        result["budgets"].append({"rejected": np.bincount(rejected, minlength=scenario.trips + 1),
+                                  "spent": np.bincount(spent, minlength=budget + 1)})
+    return result
+
+def _quantiles(histogram, qs):
+    cumulative = np.cumsum(histogram)
+    return {f"p{int(q * 100)}": int(np.searchsorted(cumulative, q * cumulative[-1])) for q in qs}
+
+def simulate(budgets, runs=200_000, scenario=None, workers=None, chunk=20_000, seed=0):
+    scenario = scenario or Scenario(seed=seed)
+    budgets = sorted(set(int(b) for b in budgets))
+    cap = scenario.demand_cap()
+    sizes = [min(chunk, runs - start) for start in range(0, runs, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))          #niezalezne strumienie na paczke
+    tasks = [(scenario, budgets, size, s, cap) for size, s in zip(sizes, seeds)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        parts = list(pool.map(_simulate, tasks))
+    elapsed = time.perf_counter() - start
+
+    demand = sum(p["demand"] for p in parts)
+    qs = (0.05, 0.5, 0.9, 0.95, 0.99)
+    report = {"runs": runs, "trips": scenario.trips, "seconds": elapsed,
+              "demand": dict(_quantiles(demand, qs), mean=float(np.arange(cap + 1) @ demand / runs)),
+              "budgets": {}}
+    for i, budget in enumerate(budgets):
+        rejected = sum(p["budgets"][i]["rejected"] for p in parts)
+        spent = sum(p["budgets"][i]["spent"] for p in parts)
+        report["budgets"][budget] = {
+            "over_budget": float(1 - rejected[0] / runs),           #choc jedno Trip.confirm odrzucone
+            "all_rejected": float(rejected[scenario.trips] / runs),
+            "rejected": {k: float(c / runs) for k, c in enumerate(rejected)},
+            "spent": dict(_quantiles(spent, qs), mean=float(np.arange(budget + 1) @ spent / runs)),
+        }
+    #budzet, przy ktorym wszystkie podroze mieszcza sie z danym prawdopodobienstwem
+    report["recommended"] = _quantiles(demand, (0.9, 0.95, 0.99))
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja Monte Carlo budżetu podróży")
+    parser.add_argument("--budget", type=int, nargs="+", default=[2000, 3000])
+    parser.add_argument("--runs", type=int, default=200_000, help="liczba symulowanych sekwencji")
+    parser.add_argument("--trips", type=int, default=3, help="podróże (Trip.confirm) w sekwencji")
+    parser.add_argument("--volatility", type=float, default=0.15, help="odchylenie logarytmu ceny")
+    parser.add_argument("--season", type=float, default=0.2, help="amplituda sezonowości")
+    parser.add_argument("--max-nights", type=int, default=1, help="1 = cena hotelu za cały pobyt, jak w kreatorze")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="zapisz pełny raport do pliku")
+    args = parser.parse_args()
+
+    scenario = Scenario(trips=args.trips, volatility=args.volatility, season=args.season,
+                        max_nights=args.max_nights, seed=args.seed)
+    report = simulate(args.budget, args.runs, scenario, args.workers, args.chunk, args.seed)
+    print(f"sekwencje: {report['runs']:,}, podróże w sekwencji: {report['trips']}, czas: {report['seconds']:.2f} s")
+    demand = report["demand"]
+    print(f"koszt wszystkich podróży: średnio {demand['mean']:.0f} zł, p50 {demand['p50']} zł, p95 {demand['p95']} zł")
+    print(f"{'budżet':>8}{'P(przekroczenie)':>18}{'wydane p50':>12}{'wydane p95':>12}")
+    for budget, stats in report["budgets"].items():
+        print(f"{budget:>8}{stats['over_budget']:>18.2%}{stats['spent']['p50']:>12}{stats['spent']['p95']:>12}")
+    print("zalecany budżet: " + ", ".join(f"{k}: {v} zł" for k, v in report["recommended"].items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import struct
+import zlib
+from array import array
+
+from engine import CatalogProvider
+from money import Money
+
+MAGIC = b"TPSN"
+VERSION = 2
+HEADER = struct.Struct("<4sHId")        #magic, wersja, crc32 reszty pliku, kiedy cennik pobrano ze zrodla
+COUNT = struct.Struct("<II")            #liczba elementow, dlugosc danych w bajtach
+BUDGET = struct.Struct("<q")
+
+#kolejnosc pol kreatora w pliku; nowe pola tylko na koniec i z podbiciem VERSION
+FIELDS = ("destination", "destination_query", "departure", "return_date", "airline", "seat",
+          "hotel_choice", "selected_payment")
+
+class SnapshotError(ValueError):
+    pass
+
+class SnapshotCatalog(CatalogProvider):
+    def __init__(self, airlines, hotels, destinations, version=None):
+        self._airlines = airlines
+        self._hotels = hotels
+        self._destinations = destinations
+        self._version = version
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def airlines(self):
+        return self._airlines
+
+    @property
+    def hotels(self):
+        return self._hotels
+
+    @property
+    def destinations(self):
+        return self._destinations
+
+class Snapshot:
+    def __init__(self, step, account, budget, fields, airlines, hotels, destinations,
+                 catalog_version=None, catalog_loaded_at=0.0):
+        self.step = step
+        self.account = account
+        self.budget = budget
+        self.fields = fields
+        self.airlines = airlines
+        self.hotels = hotels
+        self.destinations = destinations
+        self.catalog_version = catalog_version
+        self.catalog_loaded_at = catalog_loaded_at
+
+    def catalog_fresh(self, version, max_age, now):
+        #kopia cennika tylko dla tej samej wersji zrodla i nie starsza niz max_age sekund
+        return version is not None and self.catalog_version == version and now - self.catalog_loaded_at < max_age
+
+    def catalog(self):
+        return SnapshotCatalog(self.airlines, self.hotels, self.destinations, self.catalog_version)
+
+def _pack_strings(out, strings):
+    data = "\0".join(strings).encode("utf-8")
+    out += COUNT.pack(len(strings), len(data))
+    out += data
+
+def _pack_prices(out, prices):
+    #ceny jako int64 (Money: grosze/centy), do tego rzadka lista pozycji Money z waluta
+    _pack_strings(out, list(prices))
+    out += array("q", (p.minor if isinstance(p, Money) else p for p in prices.values())).tobytes()
+    money = [(i, p.currency) for i, p in enumerate(prices.values()) if isinstance(p, Money)]
+    _pack_strings(out, [currency for _, currency in money])
+    out += array("q", (i for i, _ in money)).tobytes()
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def take(self, size):
+        if self.offset + size > len(self.data):
+            raise SnapshotError("Uszkodzony plik sesji")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def strings(self):
+        count, size = COUNT.unpack(self.take(COUNT.size))
+        if not count:
+            self.take(size)
+            return []
+        return str(self.take(size), "utf-8").split("\0")
+
+    def ints(self, count):
+        values = array("q")
+        values.frombytes(self.take(8 * count))
+        return values.tolist()
+
+    def prices(self):
+        names = self.strings()
+        values = self.ints(len(names))
+        prices = dict(zip(names, values))
+        currencies = self.strings()
+        for i, currency in zip(self.ints(len(currencies)), currencies):
+            prices[names[i]] = Money(values[i], currency)
+        return prices
+
+def dump_snapshot(snapshot):
+    body = bytearray()
+    _pack_strings(body, [snapshot.step, snapshot.account, snapshot.catalog_version or ""])
+    body += BUDGET.pack(snapshot.budget)
+    _pack_strings(body, [snapshot.fields.get(name, "") for name in FIELDS])
+    _pack_strings(body, list(snapshot.destinations))
+    _pack_prices(body, snapshot.airlines)
+    _pack_prices(body, snapshot.hotels)
+    return HEADER.pack(MAGIC, VERSION, zlib.crc32(body), snapshot.catalog_loaded_at) + body
+
+def parse_snapshot(data):
+    if len(data) < HEADER.size:
+        raise SnapshotError("Uszkodzony plik sesji")
+    magic, version, crc, loaded_at = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("To nie jest plik sesji planera")
+    if version != VERSION:
+        raise SnapshotError(f"Nieobsługiwana wersja pliku sesji: {version}")
+    body = memoryview(data)[HEADER.size:]
+    if zlib.crc32(body) != crc:
+        raise SnapshotError("Uszkodzony plik sesji")
+    reader = _Reader(body)
+    step, account, catalog_version = reader.strings()
+    budget, = BUDGET.unpack(reader.take(BUDGET.size))
+    fields = dict(zip(FIELDS, reader.strings()))
+    destinations = reader.strings()
+    airlines = reader.prices()
+    hotels = reader.prices()
+    return Snapshot(step, account, budget, fields, airlines, hotels, destinations, catalog_version or None, loaded_at)
+
+def save_snapshot(path, snapshot):
+    data = dump_snapshot(snapshot)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return parse_snapshot(f.read())
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from aggregator import ConnectionPool, HttpFareProvider, QuoteAggregator, ProviderError
+
+#lokalny serwer dostawcy: kolejne zadania dostaja kolejne odpowiedzi (opoznienie, status, cennik)
+class StubServer:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.connections = 0
+        self.requests = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+                self.requests.append(line.decode().split()[1])
+                delay, status, prices = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+                await asyncio.sleep(delay)
+                body = json.dumps(prices).encode()
+                writer.write(f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/fares"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+def test_connection_is_reused():
+    async def scenario():
+        async with StubServer([(0, 200, {"LOT": 800})]) as stub:
+            pool = ConnectionPool()
+            provider = HttpFareProvider("stub", stub.url, pool)
+            results = [await provider.quote("Rzym", "2026-07-01", "Okno") for _ in range(3)]
+            await pool.close()
+            return results, stub.connections, stub.requests[0]
+    results, connections, target = run(scenario())
+    assert results == [{"LOT": 800}] * 3
+    assert connections == 1
+    assert target.startswith("/fares?destination=Rzym&date=2026-07-01")
+
+def test_non_200_is_provider_error():
+    async def scenario():
+        async with StubServer([(0, 503, {})]) as stub:
+            pool = ConnectionPool()
+            with pytest.raises(ProviderError):
+                await HttpFareProvider("stub", stub.url, pool).quote("Rzym", None, None)
+            await pool.close()
+    run(scenario())
+
+def test_timeout_reports_error():
+    async def scenario():
+        async with StubServer([(5, 200, {"LOT": 800})]) as stub:
+            pool = ConnectionPool()
+            aggregator = QuoteAggregator([HttpFareProvider("wolny", stub.url, pool)], timeout=0.1, hedge_after=0.05)
+            results = [item async for item in aggregator.stream("Rzym")]
+            await pool.close()
+            return results
+    (name, quotes, error), = run(scenario())
+    assert name == "wolny" and quotes is None and isinstance(error, asyncio.TimeoutError)
+
+def test_hedged_attempt_wins():
+    async def scenario():
+        #pierwsza proba wisi, druga (po hedge_after) odpowiada od razu
+        async with StubServer([(5, 200, {"LOT": 900}), (0, 200, {"LOT": 700})]) as stub:
+            pool = ConnectionPool()
+            aggregator = QuoteAggregator([HttpFareProvider("stub", stub.url, pool)], timeout=2, hedge_after=0.05)
+            start = time.perf_counter()
+            fares = await aggregator.gather("Rzym")
+            elapsed = time.perf_counter() - start
+            await pool.close()
+            return fares, elapsed, len(stub.requests)
+    fares, elapsed, requests = run(scenario())
+    assert fares == {"LOT": 700}
+    assert elapsed < 1
+    assert requests == 2
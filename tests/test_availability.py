@@ -0,0 +1,87 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from availability import AvailabilityIndex, FlightAvailability, HotelAvailability, UnavailableException
+
+START = date(2026, 7, 1)
+
+def day(n):
+    return (START + timedelta(days=n)).isoformat()
+
+def test_bookable_over_range():
+    #10 dni (drzewo na 16 lisciach); Hotel B pelny 3 lipca, Hotel C tylko 1 pokoj
+    hotels = HotelAvailability(["Hotel A", "Hotel B", "Hotel C"], START, 10,
+                               {"Hotel A": 2, "Hotel B": 2, "Hotel C": 1})
+    hotels.set_capacity("Hotel B", day(2), 0)
+    assert hotels.bookable(day(0), day(2)) == ["Hotel A", "Hotel B", "Hotel C"]        #noce 1 i 2 lipca
+    assert hotels.bookable(day(0), day(3)) == ["Hotel A", "Hotel C"]
+    assert hotels.bookable(day(3), day(10)) == ["Hotel A", "Hotel B", "Hotel C"]
+    assert hotels.bookable(day(5), day(5)) == ["Hotel A", "Hotel B", "Hotel C"]        #ta sama data: 1 noc
+    assert hotels.bookable(day(-1), day(3)) == [] and hotels.bookable(day(5), day(11)) == []
+
+def test_hold_and_release_cross_zero_capacity():
+    index = AvailabilityIndex(["A", "B"], START, 5, {"A": 2, "B": 1})
+    first = index.hold("A", [day(1), day(2)])
+    assert index.available_between(day(0), day(5)) == ["A", "B"]          #A ma jeszcze 1 miejsce
+    second = index.hold("A", [day(2), day(3)])
+    assert index.free("A", day(2)) == 0
+    assert index.available_between(day(0), day(5)) == ["B"]
+    assert index.available_between(day(0), day(2)) == ["A", "B"]
+    with pytest.raises(UnavailableException):
+        index.hold("A", [day(2)])
+    index.release(first)
+    index.release(first)                                                    #drugi raz bez zmian
+    assert [index.free("A", day(d)) for d in range(5)] == [2, 2, 1, 1, 2]
+    assert index.available_between(day(0), day(5)) == ["A", "B"]
+    index.release(second)
+    assert [index.free("A", day(d)) for d in range(5)] == [2] * 5
+    with pytest.raises(UnavailableException):
+        index.hold("B", [day(0)], count=2)
+    with pytest.raises(UnavailableException):
+        index.hold("B", [day(5)])
+
+def test_set_capacity_updates_ranges():
+    index = AvailabilityIndex(["A", "B"], START, 7, 0)
+    assert index.available_between(day(0), day(7)) == []
+    for d in range(7):
+        index.set_capacity("B", day(d), 3)
+    assert index.available_between(day(0), day(7)) == ["B"]
+    index.set_capacity("B", day(6), 0)
+    assert index.available_between(day(0), day(7)) == []
+    assert index.available_between(day(0), day(6)) == ["B"]
+    assert index.available_on([day(1), day(6)]) == []
+    index.set_capacity("A", day(1), 1)
+    assert index.available_on([day(1)]) == ["A", "B"]
+
+def test_flight_capacity_per_route():
+    flights = FlightAvailability(["LOT", "Ryanair"], "2026-07-01", 30, capacity=1)
+    hold = flights.hold_seats("LOT", "Paryż", "2026-07-01", "2026-07-08")
+    assert flights.bookable("Paryż", "2026-07-01", "2026-07-08") == ["Ryanair"]
+    assert flights.bookable("Rzym", "2026-07-01", "2026-07-08") == ["LOT", "Ryanair"]
+    with pytest.raises(UnavailableException):
+        flights.hold_seats("LOT", "Paryż", "2026-07-01", "2026-07-08")
+    flights.release(hold)
+    assert flights.bookable("Paryż", "2026-07-01", "2026-07-08") == ["LOT", "Ryanair"]
+
+def test_matches_counts_after_random_updates():
+    rng = random.Random(3)
+    names = ["A", "B", "C", "D"]
+    index = AvailabilityIndex(names, START, 13, 2)
+    holds = []
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.4:
+            try:
+                holds.append(index.hold(rng.choice(names), [day(rng.randrange(13)) for _ in range(3)]))
+            except UnavailableException:
+                pass
+        elif action < 0.7 and holds:
+            index.release(holds.pop(rng.randrange(len(holds))))
+        else:
+            index.set_capacity(rng.choice(names), day(rng.randrange(13)), rng.randrange(3))
+        lo = rng.randrange(13)
+        hi = rng.randrange(lo + 1, 14)
+        expected = [n for n in names if all(index.free(n, day(d)) > 0 for d in range(lo, hi))]
+        assert index.available_between(day(lo), day(hi)) == expected
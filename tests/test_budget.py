@@ -0,0 +1,44 @@
+import pytest
+
+from budget import BudgetLedger
+from engine import OverBudgetException
+from seats import SeatMap
+
+def test_reserve_commit_release():
+    ledger = BudgetLedger({"a": 100})
+    reservation = ledger.reserve("a", 60)
+    with pytest.raises(OverBudgetException):
+        ledger.reserve("a", 50)
+    ledger.release(reservation)
+    ledger.commit(ledger.reserve("a", 70))
+    assert ledger.snapshot("a") == {"available": 30, "reserved": 0, "spent": 70}
+
+def test_negative_amounts_rejected():
+    ledger = BudgetLedger({"a": 100})
+    with pytest.raises(ValueError):
+        ledger.reserve("a", -50)
+    with pytest.raises(ValueError):
+        ledger.deposit("a", -50)
+    assert ledger.balance("a") == 100
+
+def test_committed_seat_can_be_released():
+    seats = SeatMap(1, "AB")
+    hold = seats.hold()
+    seats.commit(hold)
+    assert seats.free_seats() == 1
+    seats.release(hold)
+    assert seats.free_seats() == 2
+    seats.release(hold)             #drugi raz nic nie zmienia
+    assert seats.free_seats() == 2
+
+def test_reservation_is_settled_once():
+    ledger = BudgetLedger({"a": 1000})
+    released = ledger.reserve("a", 300)
+    ledger.release(released)
+    ledger.release(released)
+    ledger.commit(released)
+    committed = ledger.reserve("a", 200)
+    ledger.commit(committed)
+    ledger.release(committed)
+    ledger.commit(committed)
+    assert ledger.snapshot("a") == {"available": 800, "reserved": 0, "spent": 200}
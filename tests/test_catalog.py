@@ -0,0 +1,80 @@
+from catalog import TTLCache, CachedCatalogProvider, _MISSING
+from engine import CatalogProvider
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+#lokalny dostawca cen: cena zalezy od trasy, dnia i miejsca, liczy zapytania
+class CountingProvider(CatalogProvider):
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def airlines(self):
+        return {"LOT": 800}
+
+    @property
+    def hotels(self):
+        return {"Hotel A": 600}
+
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        self.calls += 1
+        return 800 + len(destination or "") + (int(day[-2:]) if day else 0) + (50 if seat == "Okno" else 0)
+
+    def hotel_price(self, name, destination=None, day=None, default=0):
+        self.calls += 1
+        return 600 + len(destination or "")
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.put("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is _MISSING
+    assert len(cache) == 0
+
+def test_lru_eviction_order():
+    cache = TTLCache(maxsize=2, ttl=60, clock=Clock())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")                  #"b" najdawniej uzywane
+    cache.put("c", 3)
+    assert cache.get("b") is _MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+def test_counters():
+    cache = TTLCache(maxsize=1, ttl=60, clock=Clock())
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+    cache.put("b", 2)
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 1}
+
+def test_flight_price_keys_by_destination_day_and_seat():
+    provider = CountingProvider()
+    catalog = CachedCatalogProvider(provider, clock=Clock())
+    base = catalog.flight_price("LOT", "Rzym", "2026-07-01", "Środek")
+    assert catalog.flight_price("LOT", "Rzym", "2026-07-01", "Środek") == base
+    assert provider.calls == 1
+    assert catalog.flight_price("LOT", "Paryż", "2026-07-01", "Środek") == base + 1
+    assert catalog.flight_price("LOT", "Rzym", "2026-07-02", "Środek") == base + 1
+    assert catalog.flight_price("LOT", "Rzym", "2026-07-01", "Okno") == base + 50
+    assert provider.calls == 4
+    assert catalog.hotel_price("Hotel A", "Rzym") == 604
+    assert catalog.hotel_price("Hotel A", "Rzym") == 604
+    assert provider.calls == 5
+
+def test_cached_prices_expire():
+    clock = Clock()
+    provider = CountingProvider()
+    catalog = CachedCatalogProvider(provider, ttl=10, clock=clock)
+    catalog.flight_price("LOT", "Rzym")
+    clock.now = 11
+    catalog.flight_price("LOT", "Rzym")
+    assert provider.calls == 2
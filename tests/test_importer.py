@@ -0,0 +1,51 @@
+import pytest
+
+from importer import iter_trips, TripImportError
+from money import Money
+from trip_table import TripTable
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+def test_non_object_lines_are_skipped(tmp_path):
+    path = write(tmp_path, "trips.jsonl",
+                 '{"destination": "Rzym", "budget": 3000}\n[1, 2]\n{zly json\n"tekst"\n{"destination": "Paryż"}\n')
+    assert [t.destination for t in iter_trips(path, skip_invalid=True)] == ["Rzym", "Paryż"]
+    with pytest.raises(TripImportError) as e:
+        list(iter_trips(path))
+    assert e.value.line == 2
+
+def test_csv_prices_are_exact(tmp_path):
+    path = write(tmp_path, "trips.csv",
+                 "destination,budget,departure_date,return_date,airline,seat,flight_price,hotel_name,hotel_price\n"
+                 "Rzym,3000,2026-07-01,2026-07-08,LOT,Okno,800,Hotel A,600.00\n"
+                 "Paryż,3000,2026-07-01,2026-07-08,LOT,Okno,499.99,Hotel A,600\n"
+                 "Londyn,abc,2026-07-01,2026-07-08,LOT,Okno,800,Hotel A,600\n")
+    rome, paris = iter_trips(path, skip_invalid=True)
+    assert rome.transport.price == 800 and rome.hotel.price == 600
+    assert type(rome.hotel.price) is int
+    assert paris.transport.price == Money(49999, "PLN")
+    assert paris.total_cost() == Money(109999, "PLN")
+
+    table = TripTable()
+    table.append(rome)
+    assert list(table.total_costs()) == [1400]
+    with pytest.raises(ValueError):
+        table.append(paris)
+
+def test_json_decimal_prices(tmp_path):
+    path = write(tmp_path, "trips.jsonl", '{"destination": "Rzym", "transport": {"price": 99.5, "airline": "LOT"}}\n')
+    trip, = iter_trips(path)
+    assert trip.transport.price == Money(9950, "PLN")
+
+def test_nights_must_be_positive_int(tmp_path):
+    lines = ['{"destination": "Rzym", "hotel": {"name": "Hotel A", "price": 600, "nights": %s}}' % n
+             for n in ('"3"', "0", "true", "null", "2.5", "3")]
+    path = write(tmp_path, "trips.jsonl", "\n".join(lines) + "\n")
+    trip, = iter_trips(path, skip_invalid=True)
+    assert trip.total_cost() == 1800
+    with pytest.raises(TripImportError) as e:
+        list(iter_trips(path))
+    assert e.value.line == 1
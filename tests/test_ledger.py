@@ -0,0 +1,48 @@
+from engine import Trip, Flight, Hotel
+from ledger import TripLedger, PENDING, PAID, FAILED
+from routes import Leg
+
+def make_trip():
+    trip = Trip("Rzym", 3000)
+    trip.departure_date, trip.return_date = "2026-07-01", "2026-07-08"
+    trip.transport = Flight(price=800, airline="LOT", seat="Okno")
+    trip.hotel = Hotel("Hotel A", 600)
+    return trip
+
+def test_failed_payment_is_refunded_and_hidden():
+    with TripLedger(":memory:", initial_budget=3000) as ledger:
+        paid = ledger.record(make_trip(), "Karta", PENDING)
+        failed = ledger.record(make_trip(), "Karta", PENDING)
+        assert ledger.remaining_budget == 200
+        ledger.set_status(paid, PAID)
+        ledger.set_status(failed, FAILED)
+        ledger.set_status(failed, FAILED)           #drugi raz bez ponownego zwrotu
+        assert ledger.remaining_budget == 1600
+        assert ledger.status(paid) == PAID and ledger.status(failed) == FAILED
+        assert ledger.spend_per_destination("2026-07-01", "2026-07-31") == {"Rzym": 1400}
+        assert len(list(ledger.trips_between("2026-07-01", "2026-07-31"))) == 1
+
+def test_row_prices_add_up_to_total():
+    trip = make_trip()
+    trip.hotel = Hotel("Hotel A", 600, 3)
+    trip.legs = [Leg(200, "LOT", "WAW", "FRA", 0, 90)]
+    with TripLedger(":memory:", initial_budget=5000) as ledger:
+        ledger.record(trip, "Karta")
+        row = ledger.connection.execute("SELECT flight_price, hotel_price, total_cost FROM trips").fetchone()
+    assert row == (1000, 1800, 2800)
+
+def test_single_leg_trip_has_no_leg_list():
+    assert Trip("Rzym", 3000).legs == ()
+
+def test_pending_rows_are_failed_on_reopen(tmp_path):
+    path = str(tmp_path / "trips.db")
+    with TripLedger(path, initial_budget=3000) as ledger:
+        pending = ledger.record(make_trip(), "Karta", PENDING)
+        paid = ledger.record(make_trip(), "Karta", PENDING)
+        ledger.set_status(paid, PAID)
+        assert ledger.remaining_budget == 200
+    #platnosc w toku przerwana zamknieciem aplikacji
+    with TripLedger(path) as ledger:
+        assert ledger.status(pending) == FAILED and ledger.status(paid) == PAID
+        assert ledger.remaining_budget == 1600
+        assert ledger.fail_pending() == 0
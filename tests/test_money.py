@@ -0,0 +1,80 @@
+import pytest
+
+from engine import Trip, Flight, Hotel, OverBudgetException
+from money import Money, RateTable, CurrencyConverter, CurrencyMismatch
+from quotes import quote_batch
+from snapshot import SnapshotCatalog
+
+@pytest.fixture
+def converter():
+    return CurrencyConverter(RateTable(1, {"EUR": "4.25", "GBP": "5"}))
+
+def test_int_budget_with_mixed_currencies(converter):
+    trip = Trip("Paryż", 1100)
+    trip.transport = Flight(price=Money.of(100, "EUR"), airline="LOT", seat="Okno")     #425 zł
+    trip.hotel = Hotel("Hotel A", 600)
+    assert trip.total_cost(converter=converter) == Money.of(1025, "PLN")
+    trip.confirm(converter)
+
+    trip.budget = 1024
+    with pytest.raises(OverBudgetException):
+        trip.confirm(converter)
+
+def test_money_budget_compared_in_budget_currency(converter):
+    trip = Trip("Londyn", Money.of(200, "GBP"))
+    trip.transport = Flight(price=Money.of("100.00", "EUR"), airline="LOT", seat="Okno")  #85 GBP
+    trip.hotel = Hotel("Hotel A", 575)                                                   #115 GBP
+    assert trip.total_cost("GBP", converter) == Money.of(200, "GBP")
+    trip.confirm(converter)
+    trip.hotel = Hotel("Hotel A", 576)
+    with pytest.raises(OverBudgetException):
+        trip.confirm(converter)
+
+def test_int_prices_stay_int():
+    trip = Trip("Rzym", 3000)
+    trip.transport = Flight(price=800, airline="LOT", seat="Okno")
+    trip.hotel = Hotel("Hotel A", 600, 2)
+    assert trip.total_cost() == 2000
+    trip.confirm()
+
+def test_money_is_never_equal_to_bare_number():
+    #rowne obiekty musza miec rowny hash
+    assert Money(0, "EUR") != 0 and 0 != Money(0, "PLN")
+    assert len({Money(0, "EUR"), 0}) == 2
+
+def test_int_first_then_money_takes_converted_path(converter):
+    trip = Trip("Paryż", 1100)
+    trip.transport = Flight(price=425, airline="LOT", seat="Okno")
+    trip.hotel = Hotel("Hotel A", Money.of(100, "EUR"))
+    assert trip.total_cost(converter=converter) == Money.of(850, "PLN")
+
+def test_money_with_bare_number_is_type_error():
+    with pytest.raises(TypeError):
+        Money(1) + 5
+    with pytest.raises(TypeError):
+        Money(1) < 5
+    with pytest.raises(CurrencyMismatch):
+        Money(1, "PLN") + Money(1, "EUR")
+    assert sum([Money(1), Money(2)]) == Money(3)
+
+def test_convert_rounds_half_even(converter):
+    #1 grosz = 1/4.25 centa
+    assert converter.convert(Money(2, "PLN"), "EUR") == Money(0, "EUR")
+    assert converter.convert(Money(3, "PLN"), "EUR") == Money(1, "EUR")
+    many = converter.convert_many([2, 3, 1000], ["PLN", "PLN", "EUR"], "EUR")
+    assert list(many) == [0, 1, 1000]
+
+def test_convert_many_matches_convert_for_float_rates():
+    #kursy z floatow daja Fraction z mianownikiem 10**15; int64 nie wystarcza
+    converter = CurrencyConverter(RateTable(1, {"EUR": 1 / 0.2335, "GBP": 1 / 0.2036}))
+    minors = [50000, -50000, 1, 10 ** 9]
+    many = converter.convert_many(minors, ["EUR"] * len(minors), "GBP")
+    assert list(many) == [converter.convert(Money(m, "EUR"), "GBP").minor for m in minors]
+    assert many[0] == 43597
+
+def test_quote_batch_requires_currency_for_money_catalog(converter):
+    catalog = SnapshotCatalog({"LOT": Money.of(100, "EUR")}, {"Hotel A": 600}, ["Paryż"])
+    with pytest.raises(ValueError):
+        quote_batch([{}], 3000, catalog)
+    quote = quote_batch([{}], 3000, catalog, currency="PLN", converter=converter)
+    assert quote.cheapest(0)[3] == 102500
@@ -0,0 +1,42 @@
+from catalog import CachedCatalogProvider
+from engine import PriceCatalog
+from optimizer import affordable_hotels, optimize
+
+#cena zalezy od celu, dnia i miejsca: lipiec drozszy w hotelach, okno z doplata
+class RoutePricing(PriceCatalog):
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        return self.airlines[airline] + 10 * len(destination or "") + (100 if seat == "Okno" else 0)
+
+    def hotel_price(self, name, destination=None, day=None, default=0):
+        return self.hotels[name] + (200 if day and day.startswith("2026-07") else 0)
+
+def brute_force(catalog, destination, day, budget, seat):
+    costs = [(catalog.flight_price(a, destination, day, seat) + catalog.hotel_price(h, destination, day), a, h)
+             for a in catalog.airlines for h in catalog.hotels]
+    return sorted(c for c in costs if c[0] <= budget)
+
+def test_affordable_hotels_use_route_and_day_prices():
+    catalog = CachedCatalogProvider(RoutePricing())
+    #Ryanair do Rzymu 640; w lipcu Hotel C kosztuje 1200 -> 1840 > 1700
+    assert affordable_hotels(1700, 640, catalog, "Rzym", "2026-07-01") == ["Hotel A", "Hotel B"]
+    assert affordable_hotels(1700, 640, catalog, "Rzym", "2026-03-01") == ["Hotel A", "Hotel B", "Hotel C"]
+
+def test_optimize_matches_brute_force():
+    catalog = RoutePricing()
+    for budget in (1000, 1500, 1700, 2200, 5000):
+        for seat in ("Okno", "Środek"):
+            found = optimize("Rzym", "2026-07-01", "2026-07-08", budget, k=9, catalog=catalog, seat=seat)
+            expected = brute_force(catalog, "Rzym", "2026-07-01", budget, seat)
+            assert sorted((i.cost, i.airline, i.hotel) for i in found) == expected      #remisy w dowolnej kolejnosci
+            assert [i.cost for i in found] == [c for c, _, _ in expected]
+            assert all(i.seat == seat for i in found)
+
+def test_optimize_top_k_and_preferences():
+    catalog = RoutePricing()
+    best, = optimize("Rzym", "2026-03-01", "2026-03-08", 3000, k=1, catalog=catalog)
+    assert (best.airline, best.hotel, best.cost) == ("Ryanair", "Hotel A", 640 + 600)
+    #silna preferencja dla LOT przesuwa go na pierwsze miejsce, koszt bez zmian
+    best, = optimize("Rzym", "2026-03-01", "2026-03-08", 3000, k=1, catalog=catalog,
+                     preferences={"LOT": 10}, weight=50)
+    assert (best.airline, best.cost) == ("LOT", 840 + 600)
+    assert optimize("Rzym", "2026-03-01", "2026-03-08", 1000, catalog=catalog) == []
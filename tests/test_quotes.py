@@ -0,0 +1,31 @@
+from catalog import CachedCatalogProvider
+from engine import PriceCatalog
+from quotes import quote_batch
+
+#cena zalezy od celu, dnia i miejsca, jak u prawdziwego dostawcy
+class RoutePricing(PriceCatalog):
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        return self.airlines[airline] + 10 * len(destination or "") + (100 if seat == "Okno" else 0)
+
+    def hotel_price(self, name, destination=None, day=None, default=0):
+        return self.hotels[name] + (200 if day and day.startswith("2026-07") else 0)
+
+def test_batch_matches_provider_pricing():
+    catalog = CachedCatalogProvider(RoutePricing())
+    requests = [{"destination": "Rzym", "departure_date": "2026-07-01"},
+                {"destination": "Londyn", "departure_date": "2026-03-01"},
+                {"destination": "Rzym", "departure_date": "2026-07-01"}]
+    quote = quote_batch(requests, [3000, 3000, 1000], catalog)
+    for n, request in enumerate(requests):
+        for a, airline in enumerate(quote.airlines):
+            for s, seat in enumerate(quote.seats):
+                for h, hotel in enumerate(quote.hotels):
+                    trip = catalog.build_trip(request["destination"], 3000, request["departure_date"], None,
+                                              airline, seat, hotel)
+                    assert quote.totals[n, a, s, h] == trip.total_cost()
+    assert quote.cheapest(0) == ("Ryanair", "Środek", "Hotel A", 600 + 40 + 800)
+    assert quote.cheapest(2) is None
+
+def test_empty_batch():
+    quote = quote_batch([], 3000)
+    assert quote.totals.shape[0] == 0
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from routes import FlightNetwork, NoRouteException, multi_leg_trip
+
+#(skad, dokad, linia, cena, wylot, przylot) w minutach
+LEGS = [
+    ("WAW", "FCO", "LOT", 900, 600, 760),
+    ("WAW", "MUC", "LOT", 300, 480, 570),
+    ("MUC", "FCO", "Lufthansa", 250, 660, 750),           #przesiadka 90 min
+    ("MUC", "FCO", "Lufthansa", 100, 590, 680),           #przesiadka 20 min: za krotka
+    ("WAW", "VIE", "Austrian", 150, 420, 500),
+    ("VIE", "ZRH", "Austrian", 100, 560, 640),
+    ("ZRH", "FCO", "Swiss", 100, 700, 790),               #2 przesiadki, razem 350
+]
+
+def test_cheapest_route_prefers_connections_within_max_stops():
+    network = FlightNetwork(LEGS)
+    cost, legs = network.cheapest_route("WAW", "FCO", max_stops=2)
+    assert cost == 350 and [leg.destination for leg in legs] == ["VIE", "ZRH", "FCO"]
+    cost, legs = network.cheapest_route("WAW", "FCO", max_stops=1)
+    assert cost == 550 and [leg.airline for leg in legs] == ["LOT", "Lufthansa"]
+    cost, legs = network.cheapest_route("WAW", "FCO", max_stops=0)
+    assert cost == 900 and len(legs) == 1
+
+def test_connection_window():
+    network = FlightNetwork(LEGS)
+    #przesiadka 20 min dopuszczona dopiero przy min_connection=15
+    assert network.cheapest_route("WAW", "FCO", max_stops=1, min_connection=15)[0] == 400
+    #maksymalnie 50 min na przesiadke: zostaje tylko lot bezposredni
+    assert network.cheapest_route("WAW", "FCO", max_stops=2, max_connection=50)[0] == 900
+    #pierwszy odcinek musi wylatywac w [earliest, latest]
+    assert network.cheapest_route("WAW", "FCO", earliest=450, latest=700)[0] == 550
+    with pytest.raises(NoRouteException):
+        network.cheapest_route("WAW", "FCO", earliest=700)
+    with pytest.raises(NoRouteException):
+        network.cheapest_route("WAW", "XXX")
+
+def test_dominated_state_does_not_hide_cheaper_route():
+    #B osiagalne taniej przez C (o przesiadke wiecej) i drozej bezposrednio; przy max_stops=2
+    #tylko drozsza droga ma jeszcze zapas na ostatni odcinek D->E i nie moze zostac zdominowana
+    network = FlightNetwork([
+        ("A", "B", "X", 100, 0, 60),
+        ("A", "C", "X", 10, 0, 60),
+        ("C", "B", "X", 10, 120, 180),
+        ("B", "D", "X", 10, 240, 300),
+        ("D", "E", "X", 10, 360, 420),
+    ])
+    cost, legs = network.cheapest_route("A", "E", max_stops=2)
+    assert cost == 120 and [leg.origin for leg in legs] == ["A", "B", "D"]
+    assert network.cheapest_route("A", "E", max_stops=3)[0] == 40
+
+def brute_force(legs, origin, destination, earliest, latest, max_stops, min_connection, max_connection):
+    best = None
+
+    def walk(airport, arrival, cost, stops):
+        nonlocal best
+        for o, d, _, price, dep, arr in legs:
+            if o != airport or not arrival + min_connection <= dep <= arrival + max_connection:
+                continue
+            if d == destination:
+                best = cost + price if best is None else min(best, cost + price)
+            elif stops < max_stops:
+                walk(d, arr, cost + price, stops + 1)
+
+    for o, d, _, price, dep, arr in legs:
+        if o == origin and earliest <= dep <= latest:
+            if d == destination:
+                best = price if best is None else min(best, price)
+            elif max_stops:
+                walk(d, arr, price, 1)
+    return best
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    airports = "ABCDEF"
+    for _ in range(30):
+        legs = []
+        for _ in range(40):
+            origin, destination = rng.sample(airports, 2)
+            departure = rng.randrange(0, 2 * 24 * 60, 15)
+            legs.append((origin, destination, rng.choice("XYZ"), rng.randrange(50, 500),
+                         departure, departure + rng.randrange(60, 300)))
+        network = FlightNetwork(legs)
+        for _ in range(10):
+            origin, destination = rng.sample(airports, 2)
+            options = dict(earliest=rng.randrange(0, 1440), max_stops=rng.randrange(0, 4),
+                           min_connection=rng.choice((30, 45, 90)), max_connection=rng.choice((180, 600, 1440)))
+            options["latest"] = options["earliest"] + 24 * 60
+            expected = brute_force(legs, origin, destination, **options)
+            if origin not in network.airport_index or destination not in network.airport_index or expected is None:
+                with pytest.raises(NoRouteException):
+                    network.cheapest_route(origin, destination, **options)
+                continue
+            cost, path = network.cheapest_route(origin, destination, **options)
+            assert cost == expected == sum(leg.price for leg in path)
+            assert path[0].origin == origin and path[-1].destination == destination
+            assert len(path) <= options["max_stops"] + 1
+            for a, b in zip(path, path[1:]):
+                assert a.destination == b.origin
+                assert options["min_connection"] <= b.departure - a.arrival <= options["max_connection"]
+
+def test_multi_leg_trip_total():
+    trip = multi_leg_trip(FlightNetwork(LEGS), "WAW", "FCO", 1000)
+    assert trip.total_cost() == 350 and trip.transport is None
+    trip.confirm()
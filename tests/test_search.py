@@ -0,0 +1,16 @@
+from search import DestinationIndex, normalize
+
+def test_normalize_strips_polish_letters():
+    assert normalize("  Łódź ") == "lodz"
+
+def test_prefix_then_fuzzy():
+    index = DestinationIndex(["Paryż", "Parma", "Rzym", "Kraków", "Wrocław"], weights={"Parma": 5})
+    assert index.search("par") == ["Parma", "Paryż"]
+    assert index.search("krakw")[0] == "Kraków"
+    assert index.search("") == []
+
+def test_prefix_stops_at_first_non_match():
+    names = [f"Miasto {i}" for i in range(1000)] + ["Zabrze"]
+    index = DestinationIndex(names)
+    assert index.search("zab") == ["Zabrze"]
+    assert len(index.search("miasto 1", 5)) == 5
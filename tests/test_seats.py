@@ -0,0 +1,14 @@
+import pytest
+
+from seats import SeatInventory, NoSeatException
+
+def test_seat_map_per_route():
+    inventory = SeatInventory(rows=1, layout="AB")
+    paris = inventory.seat_map("LOT", "Paryż", "2026-07-01")
+    for _ in range(2):
+        paris.hold()
+    with pytest.raises(NoSeatException):
+        paris.hold()
+    #ten sam przewoznik i dzien, inna trasa: osobny samolot
+    assert inventory.seat_map("LOT", "Rzym", "2026-07-01").free_seats() == 2
+    assert inventory.seat_map("LOT", "Paryż", "2026-07-01") is paris
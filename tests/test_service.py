@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import money
+from budget import BudgetLedger
+from engine import PriceCatalog
+from money import Money, RateTable, CurrencyConverter, to_json
+from service import BookingService, MAX_BODY
+from snapshot import SnapshotCatalog
+
+def make_service():
+    return BookingService(budgets=BudgetLedger({"default": 10000}))
+
+def test_full_booking_flow():
+    service = make_service()
+    status, created = service.dispatch("POST", "/sessions", {})
+    assert status == 201
+    sid = created["session"]
+    status, step = service.dispatch("POST", f"/sessions/{sid}/destination",
+                                    {"destination": "Rzym", "departure_date": "2026-07-01",
+                                     "return_date": "2026-07-08"})
+    assert (status, step["step"]) == (200, "transport")
+    status, step = service.dispatch("POST", f"/sessions/{sid}/transport", {"airline": "LOT", "seat": "Okno"})
+    assert (status, step["step"]) == (200, "hotel")
+    status, step = service.dispatch("POST", f"/sessions/{sid}/hotel", {"hotel": "Hotel A", "payment": "Karta"})
+    assert step["quote"] == {"total": 1400, "within_budget": True}
+    status, result = service.dispatch("POST", f"/sessions/{sid}/confirm", {})
+    assert (status, result["remaining"]) == (200, 8600)
+
+def test_wrong_field_types_are_bad_requests():
+    service = make_service()
+    assert service.dispatch("POST", "/sessions", {"account": ["x"]})[0] == 400
+    sid = service.dispatch("POST", "/sessions", {})[1]["session"]
+    service.dispatch("POST", f"/sessions/{sid}/destination",
+                     {"destination": "Rzym", "departure_date": "2026-07-01", "return_date": "2026-07-08"})
+    status, payload = service.dispatch("POST", f"/sessions/{sid}/transport", {"airline": ["LOT"], "seat": "Okno"})
+    assert status == 400 and "airline" in payload["error"]
+
+def test_unexpected_error_is_500():
+    service = make_service()
+    service.budgets = None              #AttributeError w create_session
+    assert service.dispatch("POST", "/sessions", {})[0] == 500
+
+def test_oversized_body_is_rejected_without_reading():
+    async def run():
+        service = make_service()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        #naglowek obiecuje 1 GB, wysylamy tylko kawalek
+        writer.write(f"POST /sessions HTTP/1.1\r\nContent-Length: {1 << 30}\r\n\r\n".encode() + b"x" * 100)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+    response = asyncio.run(run())
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 413") and b"Connection: close" in head
+    assert "error" in json.loads(body)
+    assert MAX_BODY < 1 << 30
+
+def test_money_priced_airline(monkeypatch):
+    monkeypatch.setattr(money, "_default", CurrencyConverter(RateTable(1, {"EUR": "4.2501"})))
+    catalog = SnapshotCatalog({"LOT": Money.of(100, "EUR")}, {"Hotel A": 600, "Hotel C": 1100}, ["Rzym"])
+    service = BookingService(catalog, budgets=BudgetLedger({"default": 1500}))
+    sid = service.dispatch("POST", "/sessions", {})[1]["session"]
+    service.dispatch("POST", f"/sessions/{sid}/destination",
+                     {"destination": "Rzym", "departure_date": "2026-07-01", "return_date": "2026-07-08"})
+    status, step = service.dispatch("POST", f"/sessions/{sid}/transport", {"airline": "LOT", "seat": "Okno"})
+    #425.01 zl + 1100 zl > 1500 zl
+    assert status == 200 and list(step["options"]["hotels"]) == ["Hotel A"]
+    status, step = service.dispatch("POST", f"/sessions/{sid}/hotel", {"hotel": "Hotel A", "payment": "Karta"})
+    assert step["quote"] == {"total": Money(102501, "PLN"), "within_budget": True}
+    assert json.loads(json.dumps(step, default=to_json))["quote"]["total"] == {"amount": "1025.01", "currency": "PLN"}
+    status, result = service.dispatch("POST", f"/sessions/{sid}/confirm", {})
+    #budzet w pelnych zlotowkach: 1025.01 zl rezerwuje 1026 zl
+    assert (status, result["remaining"]) == (200, 474)
+
+#doplata za okno, jak u dostawcy z cenami zaleznymi od miejsca
+class SeatPricing(PriceCatalog):
+    def flight_price(self, airline, destination=None, day=None, seat=None, default=0):
+        return self.airlines.get(airline, default) + (100 if seat == "Okno" else 0)
+
+def test_flight_is_priced_for_the_chosen_seat():
+    service = BookingService(SeatPricing(), budgets=BudgetLedger({"default": 3000}))
+    sid = service.dispatch("POST", "/sessions", {})[1]["session"]
+    service.dispatch("POST", f"/sessions/{sid}/destination",
+                     {"destination": "Rzym", "departure_date": "2026-07-01", "return_date": "2026-07-08"})
+    service.dispatch("POST", f"/sessions/{sid}/transport", {"airline": "Ryanair", "seat": "Okno"})
+    status, step = service.dispatch("POST", f"/sessions/{sid}/hotel", {"hotel": "Hotel B", "payment": "Karta"})
+    assert step["quote"]["total"] == 700 + 800
+    assert service.dispatch("POST", f"/sessions/{sid}/confirm", {})[1]["remaining"] == 1500
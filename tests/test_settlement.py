@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from engine import PaymentStrategy
+from settlement import SettlementPipeline, Payment, SettlementFailed
+
+class Recorder(PaymentStrategy):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.settled = []
+
+    def settle(self, payments):
+        if self.fail:
+            raise RuntimeError("bramka niedostępna")
+        self.settled.extend(p.amount for p in payments)
+        return [f"ok {p.amount}" for p in payments]
+
+#odmawia ujemnych kwot; pay liczy wywolania per kwota
+class Declining(PaymentStrategy):
+    def __init__(self):
+        self.calls = []
+
+    def pay(self, amount):
+        self.calls.append(amount)
+        if amount < 0:
+            raise RuntimeError("odmowa")
+        return f"ok {amount}"
+
+#bramka, ktora odrzuca cala paczke, jesli jest w niej choc jedna zla platnosc
+class AllOrNothing(Declining):
+    def settle(self, payments):
+        if any(p.amount < 0 for p in payments):
+            raise RuntimeError("paczka odrzucona")
+        return [self.pay(p.amount) for p in payments]
+
+def settle_all(strategy, amounts):
+    async def run():
+        pipeline = SettlementPipeline(flush_interval=0.01, max_attempts=3, backoff=0.001)
+        futures = [await pipeline.submit(Payment(f"k{i}", strategy, a)) for i, a in enumerate(amounts)]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        await pipeline.close()
+        return results, [p.key for p in pipeline.dead_letters]
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("strategy", [Declining, AllOrNothing])
+def test_one_bad_payment_does_not_fail_the_batch(strategy):
+    strategy = strategy()
+    results, dead = settle_all(strategy, [10, 20, -1, 30])
+    assert results[0] == "ok 10" and results[1] == "ok 20" and results[3] == "ok 30"
+    assert isinstance(results[2], SettlementFailed)
+    assert dead == ["k2"]
+    #dobre platnosci wyslane raz, zla ponawiana do max_attempts
+    assert sorted(a for a in strategy.calls if a >= 0) == [10, 20, 30]
+    assert strategy.calls.count(-1) in (0, 3)
+
+def test_settle_receives_payment_keys():
+    seen = []
+    class Keys(PaymentStrategy):
+        def settle(self, payments):
+            seen.extend(p.key for p in payments)
+            return ["ok"] * len(payments)
+    settle_all(Keys(), [1, 2])
+    assert seen == ["k0", "k1"]
+
+def test_short_result_list_fails_instead_of_hanging():
+    class Short(PaymentStrategy):
+        def settle(self, payments):
+            return []
+    results, dead = settle_all(Short(), [5])
+    assert isinstance(results[0], SettlementFailed) and dead == ["k0"]
+
+def test_payment_is_settled_once_per_key():
+    async def run():
+        pipeline = SettlementPipeline(flush_interval=0.001)
+        strategy = Recorder()
+        first = await pipeline.pay(Payment("k1", strategy, 100))
+        second = await pipeline.pay(Payment("k1", strategy, 100))
+        await pipeline.close()
+        return first, second, strategy.settled
+    assert asyncio.run(run()) == ("ok 100", "ok 100", [100])
+
+def test_settled_keys_are_evicted_after_window():
+    async def run():
+        pipeline = SettlementPipeline(flush_interval=0.001, idempotency_window=0.01)
+        strategy = Recorder()
+        await pipeline.pay(Payment("k1", strategy, 100))
+        await asyncio.sleep(0.02)
+        await pipeline.pay(Payment("k2", strategy, 50))
+        keys = set(pipeline.results)
+        await pipeline.close()
+        return keys
+    assert asyncio.run(run()) == {"k2"}
+
+def test_failed_payment_goes_to_dead_letters():
+    async def run():
+        pipeline = SettlementPipeline(flush_interval=0.001, max_attempts=2, backoff=0.001)
+        with pytest.raises(SettlementFailed):
+            await pipeline.pay(Payment("k1", Recorder(fail=True), 100))
+        await pipeline.close()
+        return [p.key for p in pipeline.dead_letters]
+    assert asyncio.run(run()) == ["k1"]
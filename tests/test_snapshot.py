@@ -0,0 +1,31 @@
+import pytest
+
+from engine import PriceCatalog, DEFAULT_CATALOG_VERSION, default_catalog
+from money import Money
+from snapshot import Snapshot, SnapshotError, dump_snapshot, parse_snapshot
+
+def make_snapshot(**kwargs):
+    fields = {"destination": "Paryż", "departure": "2026-07-01"}
+    airlines = {"LOT": 800, "Lufthansa": Money.of("199.99", "EUR"), "Ryanair": 600}
+    return Snapshot("hotel", "default", 2500, fields, airlines, {"Hotel A": 600}, ["Paryż", "Rzym"], **kwargs)
+
+def test_round_trip_keeps_order_and_money():
+    restored = parse_snapshot(dump_snapshot(make_snapshot(catalog_version="v1", catalog_loaded_at=100.0)))
+    assert list(restored.airlines.items()) == [("LOT", 800), ("Lufthansa", Money(19999, "EUR")), ("Ryanair", 600)]
+    assert (restored.step, restored.budget, restored.fields["departure"]) == ("hotel", 2500, "2026-07-01")
+    assert (restored.catalog_version, restored.catalog_loaded_at) == ("v1", 100.0)
+    assert restored.catalog().version == "v1"
+
+def test_corrupted_file_is_rejected():
+    data = bytearray(dump_snapshot(make_snapshot()))
+    data[-1] ^= 1
+    with pytest.raises(SnapshotError):
+        parse_snapshot(bytes(data))
+
+def test_catalog_freshness():
+    snapshot = make_snapshot(catalog_version=DEFAULT_CATALOG_VERSION, catalog_loaded_at=1000.0)
+    version = PriceCatalog().version
+    assert snapshot.catalog_fresh(version, 3600, 2000.0)
+    assert not snapshot.catalog_fresh(version, 3600, 5000.0)                  #za stary
+    assert not snapshot.catalog_fresh("inny", 3600, 2000.0)                   #inna wersja zrodla
+    assert not snapshot.catalog_fresh(PriceCatalog(lambda: default_catalog()).version, 3600, 2000.0)
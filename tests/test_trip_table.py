@@ -0,0 +1,19 @@
+import pytest
+
+from engine import Flight, Hotel, OverBudgetException, Trip
+from money import Money
+from trip_table import TripTable
+
+def trip(budget):
+    trip = Trip("Rzym", budget)
+    trip.transport = Flight(800, "LOT", "Okno")
+    trip.hotel = Hotel("Hotel A", 600)
+    return trip
+
+def test_row_confirm_uses_trip_api():
+    table = TripTable.from_trips([trip(3000), trip(1000)])
+    table[0].confirm()
+    with pytest.raises(OverBudgetException):
+        table[1].confirm()
+    assert table[0].total_cost() == 1400
+    assert table[0].total_cost("PLN") == Money(140000, "PLN")
@@ -0,0 +1,189 @@
+from array import array
+from datetime import date
+
+import numpy as np
+
+from engine import Flight, Hotel, Trip, parse_date
+from money import Money, default_converter
+
+#slownik nazw -> kod calkowity (linie, hotele, miejsca, cele podrozy)
+class Codes:
+    def __init__(self):
+        self.names = []
+        self.index = {}
+
+    def code(self, name):
+        code = self.index.get(name)
+        if code is None:
+            code = self.index[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code):
+        return self.names[code]
+
+def _date_code(value):
+    if not value:
+        return 0
+    if isinstance(value, str):
+        value = parse_date(value)
+    return value.toordinal()
+
+def _zl(value):
+    #kolumny trzymaja pelne zlotowki; Money tylko gdy da sie zapisac bez zaokraglenia
+    if isinstance(value, Money):
+        if value.currency != "PLN" or value.minor % 100:
+            raise ValueError(f"TripTable przechowuje ceny w pełnych złotych: {value}")
+        return value.minor // 100
+    return value
+
+def _date_value(code):
+    return date.fromordinal(code).isoformat() if code else None
+
+INT_COLUMNS = ("budget", "flight_price", "hotel_price")
+CODE_COLUMNS = ("destination", "airline", "seat", "hotel")
+DATE_COLUMNS = ("departure_date", "return_date")
+
+#tabela kolumnowa: ceny i budzety jako int64, nazwy jako kody, daty jako ordinal
+class TripTable:
+    def __init__(self):
+        self.columns = {name: array("q") for name in INT_COLUMNS}
+        self.columns.update((name, array("i")) for name in CODE_COLUMNS + DATE_COLUMNS)
+        self.codes = {name: Codes() for name in CODE_COLUMNS}
+        self.has_transport = array("b")
+        self.has_hotel = array("b")
+
+    @classmethod
+    def from_trips(cls, trips):
+        table = cls()
+        table.extend(trips)
+        return table
+
+    def __len__(self):
+        return len(self.has_transport)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return TripRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TripRow(self, index)
+
+    def append(self, trip):
+        c = self.columns
+        transport, hotel = trip.transport, trip.hotel
+        c["budget"].append(_zl(trip.budget))
+        c["destination"].append(self.codes["destination"].code(trip.destination))
+        c["departure_date"].append(_date_code(trip.departure_date))
+        c["return_date"].append(_date_code(trip.return_date))
+        c["flight_price"].append(_zl(transport.price if transport else 0) + sum(_zl(leg.price) for leg in trip.legs))
+        c["airline"].append(self.codes["airline"].code(getattr(transport, "airline", "")))
+        c["seat"].append(self.codes["seat"].code(getattr(transport, "seat", "")))
+        c["hotel_price"].append(_zl(hotel.total_price()) if hotel else 0)
+        c["hotel"].append(self.codes["hotel"].code(hotel.name if hotel else ""))
+        self.has_transport.append(transport is not None)
+        self.has_hotel.append(hotel is not None)
+
+    def extend(self, trips):
+        for trip in trips:
+            self.append(trip)
+
+    def column(self, name):
+        #widok numpy bez kopiowania bufora array
+        col = self.columns[name]
+        return np.frombuffer(col, dtype=np.int64 if col.typecode == "q" else np.int32, count=len(col))
+
+    def total_costs(self):
+        return self.column("flight_price") + self.column("hotel_price")
+
+    def within_budget(self, budget=None):
+        limit = self.column("budget") if budget is None else budget
+        return self.total_costs() <= limit
+
+    def over_budget(self, budget=None):
+        return np.flatnonzero(~self.within_budget(budget))
+
+    def rows(self, mask):
+        for index in np.flatnonzero(mask):
+            yield TripRow(self, int(index))
+
+class _Field:
+    def __init__(self, column, kind="int"):
+        self.column = column
+        self.kind = kind
+
+    def __get__(self, row, owner=None):
+        if row is None:
+            return self
+        table = row._table
+        value = table.columns[self.column][row._index]
+        if self.kind == "code":
+            return table.codes[self.column].name(value)
+        if self.kind == "date":
+            return _date_value(value)
+        return value
+
+    def __set__(self, row, value):
+        table = row._table
+        if self.kind == "code":
+            value = table.codes[self.column].code(value)
+        elif self.kind == "date":
+            value = _date_code(value)
+        table.columns[self.column][row._index] = value
+
+#widoki jednego wiersza zgodne z API Trip / Flight / Hotel
+class FlightRow(Flight):
+    __slots__ = ("_table", "_index")
+
+    price = _Field("flight_price")
+    airline = _Field("airline", "code")
+    seat = _Field("seat", "code")
+    mode = "Flight"
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+class HotelRow(Hotel):
+    __slots__ = ("_table", "_index")
+
+    price = _Field("hotel_price")
+    name = _Field("hotel", "code")
+    nights = 1                  #kolumna hotel_price trzyma juz cene za caly pobyt
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+class TripRow(Trip):
+    __slots__ = ("_table", "_index")
+
+    destination = _Field("destination", "code")
+    budget = _Field("budget")
+    departure_date = _Field("departure_date", "date")
+    return_date = _Field("return_date", "date")
+    legs = ()
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def transport(self):
+        return FlightRow(self._table, self._index) if self._table.has_transport[self._index] else None
+
+    @property
+    def hotel(self):
+        return HotelRow(self._table, self._index) if self._table.has_hotel[self._index] else None
+
+    def total_cost(self, currency=None, converter=None):
+        #ta sama sygnatura co Trip.total_cost; kolumny sa w zlotowkach
+        c = self._table.columns
+        total = c["flight_price"][self._index] + c["hotel_price"][self._index]
+        if currency is None:
+            return total
+        return (converter or default_converter()).convert(Money.of(total), currency)
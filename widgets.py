@@ -0,0 +1,47 @@
+import tkinter as tk
+from tkinter import ttk
+
+#lista wirtualna: Listbox zawsze ma tylko widoczne wiersze, reszta zyje w self.items
+class VirtualList(ttk.Frame):
+    def __init__(self, master, rows=8, command=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.rows = rows
+        self.command = command
+        self.items = []
+        self.offset = 0
+
+        self.listbox = tk.Listbox(self, height=rows, activestyle="none", exportselection=False)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - (1 if e.delta > 0 else -1)))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 1))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 1))
+
+    def set_items(self, items):
+        self.items = items
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, len(self.items) - self.rows))
+        self.listbox.delete(0, "end")
+        self.listbox.insert("end", *self.items[self.offset:self.offset + self.rows])
+        if self.items:
+            self.scrollbar.set(self.offset / len(self.items), min(1.0, (self.offset + self.rows) / len(self.items)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        return "break"
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection and self.command:
+            self.command(self.items[self.offset + selection[0]])